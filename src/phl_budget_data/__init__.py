@@ -1,8 +1,14 @@
 """PHL Budget Data."""
 
+import os
 from importlib.metadata import version
 from pathlib import Path
 
 __version__ = version(__package__)
 
 DATA_DIR = Path(__file__).parent.absolute() / "data"
+
+# Folder for cached files, kept outside of the package data
+USER_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "phl-budget-data"
+)
@@ -1,18 +1,39 @@
 """The main command-line interface for phl-budget-data."""
 
+from __future__ import annotations
+
 import importlib
+import importlib.util
 import itertools
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from types import ModuleType
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import click
 import rich_click
 from loguru import logger
 
 from .. import DATA_DIR
-from .etl import generate_commands as generate_etl_commands
-from .update import generate_commands as generate_update_commands
-from .utils import RichClickCommand, RichClickGroup, determine_file_name
+from .utils import (
+    LazyRichClickGroup,
+    RichClickCommand,
+    RichClickGroup,
+    determine_file_name,
+    get_max_workers,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# The processed ETL data folder for each tag of data products
+PROCESSED_FOLDERS = {
+    "spending": "budget-in-brief",
+    "qcmr": "qcmr",
+    "collections": "collections",
+}
 
 # Set up command groups for the "etl" sub-command
 rich_click.core.COMMAND_GROUPS = {"phl-budget-data etl": []}
@@ -28,7 +49,27 @@ def main() -> None:
 @main.command(cls=RichClickCommand)
 @click.option("--output", type=str, help="The output folder.")
 @click.option("--save-sql", is_flag=True, help="Whether to save SQL databases.")
-def save(output: Optional[str] = None, save_sql: bool = False) -> None:
+@click.option(
+    "--workers",
+    "--jobs",
+    "-j",
+    "workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of processes to use when loading the data.",
+)
+@click.option(
+    "--fresh",
+    is_flag=True,
+    help="Save all data products, even if they are up to date.",
+)
+def save(
+    output: Optional[str] = None,
+    save_sql: bool = False,
+    workers: int = 1,
+    fresh: bool = False,
+) -> None:
     """Save the processed data products."""
 
     # Determine the output path
@@ -45,61 +86,166 @@ def save(output: Optional[str] = None, save_sql: bool = False) -> None:
         if not output_folder.exists():
             output_folder.mkdir(parents=True)
 
-        # Get the module
-        mod = importlib.import_module(f"..etl.{tag}.processed", __package__)
+        # All of the data loaders and parameters to save
+        module_name = importlib.util.resolve_name(f"..etl.{tag}.processed", __package__)
+        tasks = _get_save_tasks(module_name)
+
+        # Skip the data products that are newer than their inputs
+        db_file = output_path / f"{tag}.db"
+        if not fresh:
+            source_mtime_ns = _get_source_mtime_ns(tag)
+            if not save_sql or _is_up_to_date(db_file, source_mtime_ns):
+                tasks = tuple(
+                    task
+                    for task in tasks
+                    if not _is_up_to_date(output_folder / task[2], source_mtime_ns)
+                )
+            if not tasks:
+                logger.info(f"Skipping {tag} (saved data is up to date)")
+                continue
+
+        # One SQL database per tag, closed even if saving fails
+        conn = sqlite3.connect(db_file) if save_sql else None
+        try:
+            _save_tasks(module_name, tasks, output_folder, conn, workers)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def _save_tasks(
+    module_name: str,
+    tasks: tuple[tuple[str, dict, str], ...],
+    output_folder: Path,
+    conn: Optional[sqlite3.Connection] = None,
+    workers: int = 1,
+) -> None:
+    """Internal function to load and save the data products for a tag."""
+
+    # Load serially
+    max_workers = get_max_workers(workers, len(tasks))
+    if max_workers <= 1:
+        for name, kwargs, filename in tasks:
+            data = _load_data(module_name, name, kwargs)
+            _save_data(data, output_folder / filename, conn)
+
+    # Load in separate processes, saving in order
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                _load_data,
+                itertools.repeat(module_name),
+                [name for name, _, _ in tasks],
+                [kwargs for _, kwargs, _ in tasks],
+            )
+            for (_, _, filename), data in zip(tasks, results):
+                _save_data(data, output_folder / filename, conn)
+
+
+def _get_save_tasks(module_name: str) -> tuple[tuple[str, dict, str], ...]:
+    """
+    Internal function to get the name, keyword arguments, and output
+    file name for each data product in the input module.
+    """
+    return tuple(_iter_save_tasks(importlib.import_module(module_name)))
+
+
+def _iter_save_tasks(mod: ModuleType) -> Iterator[tuple[str, dict, str]]:
+    """Internal function to yield the data products in the input module."""
+
+    # Loop over each data loader exported by the module
+    for name in sorted(mod.__all__):
+
+        # The function
+        f = getattr(mod, name)
 
-        # Loop over each data loader
-        for name in dir(mod):
-            if name.startswith("load"):
+        # Function has required params
+        if hasattr(f, "model"):
+
+            # Get the params
+            schema = f.model.schema()
+            params = {k: schema["properties"][k]["enum"] for k in schema["required"]}
+
+            # Do all iterations of params
+            for param_values in itertools.product(*params.values()):
+                kwargs = dict(zip(schema["required"], param_values))
+                yield name, kwargs, determine_file_name(f, **kwargs).name
+
+        # Function does not have required params
+        else:
+            yield name, {}, determine_file_name(f).name
+
+
+def _get_source_mtime_ns(tag: str) -> int:
+    """
+    Internal function to get the latest modification time of the inputs
+    to the data products for a tag: the processed ETL files and the source
+    code of the package, which includes the data loaders and the helper
+    modules they use.
+    """
+    from ..etl import ETL_DATA_DIR
+    from ..etl.utils.misc import get_source_mtime_ns, list_files
 
-                # The function
-                f = getattr(mod, name)
+    dirname = ETL_DATA_DIR / "processed" / PROCESSED_FOLDERS[tag]
+    files = list_files(dirname, ".csv", recursive=True)
 
-                # Function has required params
-                if hasattr(f, "model"):
+    return max([get_source_mtime_ns()] + [os.stat(f).st_mtime_ns for f in files])
 
-                    # Get the params
-                    schema = f.model.schema()
-                    params = {
-                        k: schema["properties"][k]["enum"] for k in schema["required"]
-                    }
 
-                    # Do all iterations of params
-                    for param_values in list(itertools.product(*params.values())):
+def _is_up_to_date(path: Path, source_mtime_ns: int) -> bool:
+    """Internal function to check if a file is newer than its inputs."""
+    return path.exists() and path.stat().st_mtime_ns >= source_mtime_ns
 
-                        kwargs = dict(zip(schema["required"], param_values))
-                        data = f(**kwargs)
 
-                        # The filename
-                        filename = determine_file_name(f, **kwargs).name
-                        output_file = output_folder / filename
-                        logger.info(f"Saving {output_file}")
-                        data.to_csv(output_file, index=False)
-                # Function does not have required params
-                else:
-                    filename = determine_file_name(f).name
-                    output_file = output_folder / filename
-                    logger.info(f"Saving {output_file}")
-                    f().to_csv(output_file, index=False)
+def _load_data(module_name: str, name: str, kwargs: dict) -> pd.DataFrame:
+    """Internal function to call the named data loader in the input module."""
+    f = getattr(importlib.import_module(module_name), name)
+    return f(**kwargs)
 
 
-@main.group(cls=RichClickGroup)
+def _save_data(
+    data: pd.DataFrame, output_file: Path, conn: Optional[sqlite3.Connection] = None
+) -> None:
+    """
+    Internal function to save data to a CSV file, and optionally, to
+    a SQL table named after the file.
+    """
+    logger.info(f"Saving {output_file}")
+    with open(output_file, "w", encoding="utf-8", buffering=1 << 20, newline="") as f:
+        data.to_csv(f, index=False, chunksize=50_000)
+
+    # Bulk insert into the database
+    if conn is not None:
+        data.to_sql(
+            output_file.stem, conn, if_exists="replace", index=False, chunksize=10_000
+        )
+        conn.commit()
+
+
+def _load_etl_commands(etl: click.Group) -> None:
+    """Generate the ETL commands and format the CLI help screen."""
+    from .etl import generate_commands
+
+    rich_click.core.COMMAND_GROUPS["phl-budget-data etl"] = generate_commands(etl)
+
+
+def _load_update_commands(update: click.Group) -> None:
+    """Generate the update commands."""
+    from .update import generate_commands
+
+    generate_commands(update)
+
+
+@main.group(cls=LazyRichClickGroup, load_commands=_load_etl_commands)
 def etl():
     """Run the ETL pipeline for the specified data source."""
     pass
 
 
-@main.group(cls=RichClickGroup)
+@main.group(cls=LazyRichClickGroup, load_commands=_load_update_commands)
 def update():
     """
     Parse the City's website to scrape and update City of
     Philadelphia budget data.
     """
     pass
-
-
-# Generate the ETL commands and format the CLI help screen
-rich_click.core.COMMAND_GROUPS["phl-budget-data etl"] = generate_etl_commands(etl)
-
-# Generate update commands
-generate_update_commands(update)
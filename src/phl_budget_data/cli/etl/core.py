@@ -1,4 +1,5 @@
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import fields
 from typing import Optional, Type, TypedDict
 
@@ -6,7 +7,39 @@ import click
 from loguru import logger
 
 from ...etl.core import ETLPipeline, get_etl_sources
-from ..utils import RichClickCommand
+from ..utils import RichClickCommand, get_max_workers
+
+
+# Names of the command groups on the help screen, in display order
+GROUP_NAMES = {
+    "collections": "Collections",
+    "spending": "Spending",
+    "qcmr": "QCMR",
+}
+
+
+# Help text for the keyword options of the ETL commands
+OPTION_HELP = {
+    "fiscal_year": "Fiscal year",
+    "quarter": "Fiscal quarter",
+    "kind": "Either 'adopted' or 'proposed'",
+    "year": "Calendar year",
+    "month": "Calendar month",
+}
+
+# Types and required keyword options (all others are optional integers)
+OPTION_TYPES = {"kind": click.Choice(["adopted", "proposed"])}
+REQUIRED_OPTIONS = frozenset(["kind"])
+
+# The patterns to try to match when extracting parameters from file names,
+# combined into one pattern that tries each alternative in order; group names
+# are prefixed (e.g., "fyq__") since they must be unique
+PARAMETER_PATTERN = re.compile(
+    "FY(?P<fyq__fiscal_year>[0-9]{2})[_-]Q(?P<fyq__quarter>[1234])"  # FYXX-QX
+    "|FY(?P<fy__fiscal_year>[0-9]{2})"  # FYXX
+    "|(?P<ym__year>[0-9]{4})[_-](?P<ym__month>[0-9]{2})"  # YYYY-MM
+    "|(?P<yq__year>[0-9]{4})[_-]Q(?P<yq__quarter>[1234])"  # YYYY-QX
+)
 
 
 class CommandGroupDict(TypedDict):
@@ -33,7 +66,30 @@ def generate_commands(etl: click.Group) -> list[CommandGroupDict]:
         is_flag=True,
         help="Only extract the data (do not transform/load).",
     )
-    def CashReport(dry_run, no_validate, extract_only, fiscal_year, quarter):
+    @click.option(
+        "--workers",
+        "--jobs",
+        "-j",
+        "workers",
+        type=int,
+        default=1,
+        show_default=True,
+        help="Number of processes to use when running the ETL.",
+    )
+    @click.option(
+        "--skip-processed",
+        is_flag=True,
+        help="Skip reports whose processed data is newer than the PDF and code.",
+    )
+    def CashReport(
+        dry_run,
+        no_validate,
+        extract_only,
+        workers,
+        skip_processed,
+        fiscal_year,
+        quarter,
+    ):
         "Run ETL on all Cash Report sources from the QCMR."
 
         # Run the ETL for Cash Report
@@ -49,18 +105,15 @@ def generate_commands(etl: click.Group) -> list[CommandGroupDict]:
                     extract_only,
                     fiscal_year=fiscal_year,
                     quarter=quarter,
+                    workers=workers,
+                    skip_processed=skip_processed,
                 )
 
-    # Names of the groups
-    groups = {
-        "qcmr": "QCMR",
-        "collections": "Collections",
-        "spending": "Spending",
-    }
     out = []
 
-    # Loop over each group
-    for group, sources in etl_sources.items():
+    # Loop over each group in a fixed order
+    for group in GROUP_NAMES:
+        sources = etl_sources[group]
 
         # Track the command names
         commands = []
@@ -82,7 +135,7 @@ def generate_commands(etl: click.Group) -> list[CommandGroupDict]:
         # Add the group
         out.append(
             {
-                "name": groups[group],
+                "name": GROUP_NAMES[group],
                 "commands": sorted(commands),
             }
         )
@@ -99,105 +152,127 @@ def _run_etl(
     quarter: Optional[int] = None,
     year: Optional[int] = None,
     month: Optional[int] = None,
+    workers: int = 1,
+    skip_processed: bool = False,
     **kwargs,
 ):
     """Internal function to run ETL on the specified class object."""
 
-    # Loop over the PDF files for the class
-    finished_params = []
+    # Filter file names by fiscal year, quarter, year and month, requiring
+    # each pattern to appear somewhere in the file name
+    patterns = []
+    if fiscal_year is not None:
+        patterns.append(f"FY{str(fiscal_year)[2:]}")
+    if quarter is not None:
+        patterns.append(f"Q{quarter}")
+    if year is not None:
+        patterns.append(f"{year}")
+    if month is not None:
+        patterns.append(f"{month:02d}")
+    stem_filter = re.compile("".join(f"(?=.*{re.escape(p)})" for p in patterns))
+
+    # Loop over the PDF files for the class, tracking the unique parameter
+    # sets in order (dict keys give constant-time membership checks)
+    finished_params: dict[tuple, None] = {}
     for f in cls.get_pdf_files():
 
-        # Filter by fiscal year
-        if fiscal_year is not None:
-            pattern = f"FY{str(fiscal_year)[2:]}"
-            if pattern not in f.stem:
-                continue
-
-        # Filter by quarter
-        if quarter is not None:
-            pattern = f"Q{quarter}"
-            if pattern not in f.stem:
-                continue
-
-        # Filter by year
-        if year is not None:
-            pattern = f"{year}"
-            if pattern not in f.stem:
-                continue
-
-        # Filter by month
-        if month is not None:
-            pattern = f"{month:02d}"
-            if pattern not in f.stem:
-                continue
+        # The file name without the suffix
+        stem = f.stem
+        if not stem_filter.match(stem):
+            continue
 
         # Extract parameters
-        params = _extract_parameters(f.stem)
+        params = _extract_parameters(stem)
         if params is None:
-            raise ValueError(f"Could not extract parameters from {f.stem}")
-
-        # ETL
-        if not dry_run:
-
-            report = None
-            all_params = {**params, **kwargs}
+            raise ValueError(f"Could not extract parameters from {stem}")
+
+        # Track the unique parameter sets
+        all_params = {**params, **kwargs}
+        finished_params[tuple(all_params.items())] = None
+
+    # Nothing to do
+    if dry_run:
+        return
+
+    # Run serially
+    max_workers = get_max_workers(workers, len(finished_params))
+    if max_workers <= 1:
+        for all_params_tup in finished_params:
+            _process_report(
+                cls, dict(all_params_tup), no_validate, extract_only, skip_processed
+            )
+        return
+
+    # Run each set of parameters in a separate process
+    logger.info(f"Running ETL with {max_workers} workers")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _process_report,
+                cls,
+                dict(all_params_tup),
+                no_validate,
+                extract_only,
+                skip_processed,
+            )
+            for all_params_tup in finished_params
+        ]
+
+        # Surface any exceptions
+        for future in as_completed(futures):
+            future.result()
+
+
+def _process_report(
+    cls: Type[ETLPipeline],
+    params: dict[str, int],
+    no_validate: bool = False,
+    extract_only: bool = False,
+    skip_processed: bool = False,
+) -> None:
+    """Internal function to run the ETL pipeline for a single set of parameters."""
 
-            # Initialize the object
-            try:
-                report = cls(**all_params)
-            except FileNotFoundError:
-                pass
-            all_params_tup = tuple(all_params.items())
+    # Initialize the object
+    try:
+        report = cls(**params)
+    except FileNotFoundError:
+        return
 
-            # Run the ETL pipeline
-            if report and all_params_tup not in finished_params:
+    # Optionally skip reports whose processed data is up to date
+    s = ", ".join(f"{k}={v}" for k, v in params.items())
+    if skip_processed and not extract_only and report.is_processed():
+        logger.info(f"Skipping: {s} (processed data is up to date)")
+        return
 
-                # Log it
-                finished_params.append(all_params_tup)
-                s = ", ".join(f"{k}={v}" for k, v in all_params.items())
-                logger.info(f"Processing: {s}")
+    # Log it
+    logger.info(f"Processing: {s}")
 
-                if not extract_only:
-                    report.extract_transform_load(validate=(not no_validate))
-                else:
-                    report.extract()
+    if not extract_only:
+        report.extract_transform_load(validate=(not no_validate))
+    else:
+        report.extract()
 
 
 def _extract_parameters(s: str) -> Optional[dict[str, int]]:
     """Extract year/quarter/month from a string."""
 
-    # The patterns to try to match
-    patterns = [
-        "FY(?P<fiscal_year>[0-9]{2})[_-]Q(?P<quarter>[1234])",  # FYXX-QX
-        "FY(?P<fiscal_year>[0-9]{2})",  # FYXX
-        "(?P<year>[0-9]{4})[_-](?P<month>[0-9]{2})",  # YYYY-MM,
-        "(?P<year>[0-9]{4})[_-]Q(?P<quarter>[1234])",  # YYYY-QX
-    ]
-    for pattern in patterns:
-        match = re.match(pattern, s)
-        if match:
-            d = dict(match.groupdict())
-            if "fiscal_year" in d:
-                d["fiscal_year"] = "20" + d["fiscal_year"]
-            return {k: int(v) for k, v in d.items()}
+    match = PARAMETER_PATTERN.match(s)
+    if match is None:
+        return None
 
-    return None
+    # Only the groups from the matching alternative are set
+    out = {}
+    for name, value in match.groupdict().items():
+        if value is not None:
+            k = name.split("__")[1]
+            out[k] = int("20" + value if k == "fiscal_year" else value)
+
+    return out
 
 
 def _get_etl_function(source: Type[ETLPipeline], etl: click.Group) -> click.Command:
     """Create and return an the ETL function for the given source."""
 
-    # Create the options dict
-    options = {
-        "fiscal_year": "Fiscal year",
-        "quarter": "Fiscal quarter",
-        "kind": "Either 'adopted' or 'proposed'",
-        "year": "Calendar year",
-        "month": "Calendar month",
-    }
-    types = {"kind": click.Choice(["adopted", "proposed"])}
-    required = ["kind"]
-
     @etl.command(
         cls=RichClickCommand,
         name=source.__name__,
@@ -210,7 +285,24 @@ def _get_etl_function(source: Type[ETLPipeline], etl: click.Group) -> click.Comm
         is_flag=True,
         help="Only extract the data (do not transform/load).",
     )
-    def etl_source(dry_run, no_validate, extract_only, **kwargs):
+    @click.option(
+        "--workers",
+        "--jobs",
+        "-j",
+        "workers",
+        type=int,
+        default=1,
+        show_default=True,
+        help="Number of processes to use when running the ETL.",
+    )
+    @click.option(
+        "--skip-processed",
+        is_flag=True,
+        help="Skip reports whose processed data is newer than the PDF and code.",
+    )
+    def etl_source(
+        dry_run, no_validate, extract_only, workers, skip_processed, **kwargs
+    ):
 
         # Run the ETL
         logger.info(f"Running ETL pipeline for {source.__name__}")
@@ -219,17 +311,21 @@ def _get_etl_function(source: Type[ETLPipeline], etl: click.Group) -> click.Comm
             dry_run=dry_run,
             no_validate=no_validate,
             extract_only=extract_only,
+            workers=workers,
+            skip_processed=skip_processed,
             **kwargs,
         )
 
-    # Add the keywords
-    for field in fields(source):
-        opt = click.Option(
+    # Add the keywords before the other options, with the last field first
+    keywords = [
+        click.Option(
             ["--" + field.name.replace("_", "-")],
-            type=types.get(field.name, int),
-            help=options[field.name] + ".",
-            required=field.name in required,
+            type=OPTION_TYPES.get(field.name, int),
+            help=OPTION_HELP[field.name] + ".",
+            required=field.name in REQUIRED_OPTIONS,
         )
-        etl_source.params.insert(0, opt)
+        for field in reversed(fields(source))
+    ]
+    etl_source.params = keywords + etl_source.params
 
     return etl_source
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Module implementing the update command for the phl-budget-data CLI."""
 
-import tempfile
-from typing import Tuple, Type
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable, Tuple, Type, TypedDict
 from urllib.error import HTTPError
 
 import click
@@ -10,128 +13,143 @@ from loguru import logger
 
 from ...etl import collections
 from ...etl.core import ETLPipeline
-from .scrape import cwd, downloaded_pdf, extract_pdf_urls, get_scraping_driver
+from ..utils import get_max_workers
+from .scrape import download_pdfs, extract_pdf_urls, scraping_session
 
 
-def generate_commands(update: click.Group) -> None:
-    """Generate the subcommands for the "update" command."""
+class MonthlyUpdateDict(TypedDict):
+    """The source of a monthly collections report to update."""
 
-    @update.command(name="wage")
-    def update_monthly_wage_collections():
-        """Check for updates to the monthly wage collection report."""
+    help: str
+    etls: Tuple[Type[ETLPipeline], ...]
+    url: Callable[[int, int], str]
+    css_identifier: str
 
-        # Get the month/year of last PDF
-        cls = collections.WageCollectionsBySector
-        year, month = _get_latest_raw_pdf(cls)
-        latest_date = pd.to_datetime(f"{month}/{year}")
 
-        # Log
-        logger.info(
-            f"Checking for PDF report for update since month '{month}' and year '{year}'"
-        )
+def _get_wage_url(year: int, month: int) -> str:
+    """The wage tax reports for the calendar year after the latest PDF."""
 
-        # Do we need to move to the next calendar year?
-        if month == 12:
-            year += 1
+    # Do we need to move to the next calendar year?
+    if month == 12:
+        year += 1
 
-        # Extract out PDF urls on the city's website
-        url = f"https://www.phila.gov/documents/{year}-wage-tax-by-industry/"
-        css_identifier = "wage-taxes"
+    return f"https://www.phila.gov/documents/{year}-wage-tax-by-industry/"
 
-        # Run the update
-        _run_monthly_update(month, year, latest_date, url, css_identifier, cls)
 
-    @update.command(name="city")
-    def update_monthly_city_collections():
-        """Check for updates to the monthly city collection report."""
+def _get_fiscal_year(year: int, month: int) -> int:
+    """The fiscal year of the reports after the latest PDF."""
 
-        # Get the month/year of next PDF to look for
-        year, month = _get_latest_raw_pdf(collections.CityTaxCollections)
-        latest_date = pd.to_datetime(f"{month}/{year}")
+    # Get the fiscal year
+    if month < 7:
+        fiscal_year = year
+    else:
+        fiscal_year = year + 1
 
-        # Log
-        logger.info(
-            f"Checking for PDF report for update since month '{month}' and year '{year}'"
-        )
+    # Do we need to move to the next fiscal year?
+    if month == 6:
+        fiscal_year += 1
 
-        # Get the fiscal year
-        if month < 7:
-            fiscal_year = year
-        else:
-            fiscal_year = year + 1
-
-        # Do we need to move to the next fiscal year?
-        if month == 6:
-            fiscal_year += 1
-
-        # Extract out PDF urls on the city's website
-        url = f"https://www.phila.gov/documents/fy-{fiscal_year}-city-monthly-revenue-collections/"
-        css_identifier = "revenue-collections"
-
-        # Run the update
-        _run_monthly_update(
-            month,
-            year,
-            latest_date,
-            url,
-            css_identifier,
+    return fiscal_year
+
+
+def _get_city_url(year: int, month: int) -> str:
+    """The city collections reports for the fiscal year after the latest PDF."""
+
+    fiscal_year = _get_fiscal_year(year, month)
+    return f"https://www.phila.gov/documents/fy-{fiscal_year}-city-monthly-revenue-collections/"
+
+
+def _get_school_url(year: int, month: int) -> str:
+    """The school collections reports for the fiscal year after the latest PDF."""
+
+    fiscal_year = _get_fiscal_year(year, month)
+    return f"https://www.phila.gov/documents/fy-{fiscal_year}-school-district-monthly-revenue-collections/"
+
+
+# The maximum number of PDFs to download at once (downloads wait on the
+# network, so this is not capped by the number of CPUs)
+MAX_DOWNLOADS = 4
+
+# The monthly collections reports to check for updates
+MONTHLY_UPDATES: dict[str, MonthlyUpdateDict] = {
+    "wage": {
+        "help": "Check for updates to the monthly wage collection report.",
+        "etls": (collections.WageCollectionsBySector,),
+        "url": _get_wage_url,
+        "css_identifier": "wage-taxes",
+    },
+    "city": {
+        "help": "Check for updates to the monthly city collection report.",
+        "etls": (
             collections.CityTaxCollections,
             collections.CityNonTaxCollections,
             collections.CityOtherGovtsCollections,
-        )
+        ),
+        "url": _get_city_url,
+        "css_identifier": "revenue-collections",
+    },
+    "school": {
+        "help": "Check for updates to the monthly school district collection report.",
+        "etls": (collections.SchoolTaxCollections,),
+        "url": _get_school_url,
+        "css_identifier": "revenue-collections",
+    },
+}
 
-    @update.command(name="school")
-    def update_monthly_school_collections():
-        """Check for updates to the monthly school district collection report."""
 
-        # Get the month/year of next PDF to look for
-        cls = collections.SchoolTaxCollections
-        year, month = _get_latest_raw_pdf(cls)
-        latest_date = pd.to_datetime(f"{month}/{year}")
+def generate_commands(update: click.Group) -> None:
+    """Generate the subcommands for the "update" command."""
 
-        # Log
-        logger.info(
-            f"Checking for PDF report for update since month '{month}' and year '{year}'"
+    # Add a subcommand for each report
+    for name, source in MONTHLY_UPDATES.items():
+        command = click.Command(
+            name,
+            callback=functools.partial(_update_monthly_collections, source),
+            help=source["help"],
         )
+        update.add_command(command)
 
-        # Get the fiscal year
-        if month < 7:
-            fiscal_year = year
-        else:
-            fiscal_year = year + 1
+    @update.command(name="all")
+    def update_all_monthly_collections():
+        """Check for updates to all of the monthly collection reports."""
 
-        # Do we need to move to the next fiscal year?
-        if month == 6:
-            fiscal_year += 1
+        # Share one scraping driver across all of the updates
+        with scraping_session():
+            for source in MONTHLY_UPDATES.values():
+                _update_monthly_collections(source)
 
-        # Log
-        logger.info(
-            f"Checking for PDF report for update since month '{month}' and year '{year}'"
-        )
 
-        # Extract out PDF urls on the city's website
-        url = f"https://www.phila.gov/documents/fy-{fiscal_year}-school-district-monthly-revenue-collections/"
-        css_identifier = "revenue-collections"
+def _update_monthly_collections(source: MonthlyUpdateDict) -> None:
+    """Internal function to check for updates to a monthly collections report."""
+
+    # Get the month/year of last PDF
+    etls = source["etls"]
+    year, month = _get_latest_raw_pdf(etls[0])
+    latest_date = pd.Timestamp(year=year, month=month, day=1)
+
+    # Log
+    logger.info(
+        f"Checking for PDF report for update since month '{month}' and year '{year}'"
+    )
 
-        # Run the update
-        _run_monthly_update(month, year, latest_date, url, css_identifier, cls)
+    # Extract out PDF urls on the city's website
+    url = source["url"](year, month)
 
-    # Add the subcommands
-    update.add_command(update_monthly_wage_collections, name="wage")
-    update.add_command(update_monthly_city_collections, name="city")
-    update.add_command(update_monthly_school_collections, name="school")
+    # Run the update
+    _run_monthly_update(month, year, latest_date, url, source["css_identifier"], *etls)
 
 
 def _get_latest_raw_pdf(cls: Type[ETLPipeline]) -> Tuple[int, int]:
     """Given an ETL class, return the latest PDF in the data directory."""
 
-    # Get PDF paths for the raw data files
+    # Get PDF file names for the raw data files
     dirname = cls.get_data_directory("raw")
-    pdf_files = dirname.glob("*.pdf")
+    with os.scandir(dirname) as it:
+        pdf_files = [entry.name for entry in it if entry.name.endswith(".pdf")]
 
     # Get the latest
-    latest = sorted(pdf_files)[-1]
-    year, month = map(int, latest.stem.split("_"))
+    latest = max(pdf_files)
+    year, month = map(int, latest[: -len(".pdf")].split("_"))
 
     return year, month
 
@@ -172,58 +190,84 @@ def _run_monthly_update(
             raise
 
     # Find out which ones are new
-    new_months = [dt for dt in pdf_urls if pd.to_datetime(dt) > latest_date]
-
-    # Download and run ETL
-    for dt in new_months:
+    months = list(pdf_urls)
+    dates = pd.to_datetime(months, format="%m/%Y")
+    new_months = [dt for dt, date in zip(months, dates) if date > latest_date]
 
-        # Split the date string
-        month, year = list(map(int, dt.split("/")))
-
-        # Download to temp dir initially
-        with tempfile.TemporaryDirectory() as tmpdir:
+    # Nothing to download
+    if not len(new_months):
+        logger.info(f"...no updates found")
+        return None
 
-            # Change the path
-            with cwd(tmpdir):
+    # The local path for each new month
+    dirname = etls[0].get_data_directory("raw")
+    local_pdf_paths = {}
+    for dt in new_months:
+        month, year = map(int, dt.split("/"))
+        local_pdf_paths[dt] = dirname / f"{year}_{month:02d}.pdf"
 
-                # Get the driver
-                driver = get_scraping_driver(tmpdir)
+    # Download the PDFs, concurrently if there are multiple months
+    for dt in new_months:
+        logger.info(f"Downloading PDF from '{pdf_urls[dt]}'")
+    try:
+        download_pdfs(
+            {pdf_urls[dt]: local_pdf_paths[dt] for dt in new_months},
+            max_workers=min(MAX_DOWNLOADS, len(new_months)),
+        )
+    except Exception:
+        _remove_files(local_pdf_paths.values())
+        raise
+
+    # Run the ETL for each month in order
+    for i, dt in enumerate(new_months):
+        month, year = map(int, dt.split("/"))
+        try:
+            _run_monthly_etls(etls, year, month)
+        except Exception:
+
+            # Remove this month and any later months that were not processed
+            _remove_files(local_pdf_paths[later] for later in new_months[i:])
+            raise
 
-                # The remote URL
-                remote_pdf_path = pdf_urls[dt]
 
-                # Log
-                logger.info(f"Downloading PDF from '{remote_pdf_path}'")
+def _remove_files(paths: Iterable[Path]) -> None:
+    """Internal function to remove the files that exist."""
+    for path in paths:
+        if path.exists():
+            path.unlink()
 
-                # Local path
-                dirname = etls[0].get_data_directory("raw")
-                local_pdf_path = dirname / f"{year}_{month:02d}.pdf"
 
-                # Download the PDF
-                with downloaded_pdf(
-                    driver, remote_pdf_path, tmpdir, interval=1
-                ) as pdf_path:
+def _run_monthly_etls(
+    etls: Tuple[Type[ETLPipeline], ...], year: int, month: int
+) -> None:
+    """
+    Internal function to run the ETL classes on a monthly PDF.
 
-                    if not local_pdf_path.parent.exists():
-                        local_pdf_path.parent.mkdir()
+    The classes parse the same PDF independently, so they are run in
+    separate processes when there is more than one.
+    """
+    # Run serially
+    max_workers = get_max_workers(len(etls), len(etls))
+    if max_workers <= 1:
+        for cls in etls:
+            _run_monthly_etl(cls, year, month)
+        return
 
-                    pdf_path.rename(local_pdf_path)
+    # Run each class in a separate process
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_monthly_etl, cls, year, month) for cls in etls]
 
-                # Run the ETL
-                try:
-                    for cls in etls:
+        # Surface any exceptions
+        for future in as_completed(futures):
+            future.result()
 
-                        # Log
-                        logger.info(f"Running ETL for {cls.__name__}")
 
-                        # Run the ETL
-                        report = cls(year=year, month=month)
-                        report.extract_transform_load()
-                except Exception:
+def _run_monthly_etl(cls: Type[ETLPipeline], year: int, month: int) -> None:
+    """Internal function to run a single ETL class on a monthly PDF."""
 
-                    if local_pdf_path.exists():
-                        local_pdf_path.unlink()
-                    raise
+    # Log
+    logger.info(f"Running ETL for {cls.__name__}")
 
-    if not len(new_months):
-        logger.info(f"...no updates found")
+    # Run the ETL
+    report = cls(year=year, month=month)
+    report.extract_transform_load()
@@ -1,17 +1,51 @@
 """Scraping utilities for getting data from phila.gov."""
 
 import calendar
+import hashlib
+import json
 import os
+import shutil
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from pathlib import Path
-from urllib.request import Request, urlopen
+from typing import Iterator, Optional
+from urllib.error import HTTPError
 
-from bs4 import BeautifulSoup
+import urllib3
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 
-MONTH_LOOKUP = [x.lower() for x in calendar.month_abbr[1:]]
+from ... import USER_CACHE_DIR
+from ...etl.utils.misc import atomic_path
+
+# Connection pool shared by all requests, so connections to the same host
+# are kept alive and reused; a stalled site times out after a few retries
+HTTP = urllib3.PoolManager(
+    timeout=urllib3.Timeout(connect=10, read=30),
+    retries=urllib3.Retry(
+        connect=3,
+        read=3,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+
+# Cached responses for conditional requests
+HTTP_CACHE_DIR = USER_CACHE_DIR / "http"
+CACHED_KEYS = frozenset(["etag", "last_modified", "text"])
+
+# Use the faster lxml parser when it is installed
+HTML_PARSER = "lxml" if builder_registry.lookup("lxml") else "html.parser"
+
+# Month numbers by lower-cased month abbreviation
+MONTH_LOOKUP = {x.lower(): i for i, x in enumerate(calendar.month_abbr) if x}
 
 
 @contextmanager
@@ -25,24 +59,77 @@ def cwd(path):
 
 
 def parse_website(url: str) -> str:
-    """Parse the input website."""
+    """
+    Parse the input website.
+
+    Responses are cached on disk with their ETag and Last-Modified headers,
+    which are sent with the next request so an unchanged page is not
+    downloaded again.
+    """
+    # The cached response for this URL
+    cache_file = HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+    cached = _read_cached_response(cache_file)
+
+    # Make a conditional request if we have a cached response
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    response = HTTP.request("GET", url, headers=headers)
 
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    web_byte = urlopen(req).read()
-    return web_byte.decode("utf-8")
+    # Page has not changed
+    if response.status == 304 and cached is not None:
+        return cached["text"]
+    elif response.status >= 400:
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
+
+    text = response.data.decode("utf-8")
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+
+    # Cache the response if it can be validated next time
+    if etag or last_modified:
+        with atomic_path(cache_file) as tmp:
+            tmp.write_text(
+                json.dumps(
+                    {"etag": etag, "last_modified": last_modified, "text": text}
+                ),
+                encoding="utf-8",
+            )
+
+    return text
+
+
+def _read_cached_response(cache_file: Path) -> Optional[dict]:
+    """
+    Internal function to read a cached response, if it exists.
+
+    Unreadable cache files are treated as a miss and removed.
+    """
+    if not cache_file.exists():
+        return None
+
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if not isinstance(cached, dict) or not CACHED_KEYS <= cached.keys():
+            raise ValueError("Invalid cached response")
+        return cached
+    except (OSError, ValueError):
+        cache_file.unlink(missing_ok=True)
+        return None
 
 
 def extract_pdf_urls(url: str, css_identifier: str) -> dict[str, str]:
     """Extract PDF urls from the input URL."""
 
-    # Parse the website
-    soup = BeautifulSoup(parse_website(url), features="html.parser")
-
-    # Get the id of the element
-    table_trs = soup.select(f"table tr[id*={css_identifier}]")
+    # Only build the tree for the table rows whose id contains the identifier
+    strainer = SoupStrainer("tr", id=lambda v: v is not None and css_identifier in v)
+    soup = BeautifulSoup(parse_website(url), features=HTML_PARSER, parse_only=strainer)
 
     out = {}
-    for tr in table_trs:
+    for tr in soup.find_all("tr"):
         # Get the url
         a = tr.select_one("a")
         if a is not None:
@@ -62,7 +149,7 @@ def extract_pdf_urls(url: str, css_identifier: str) -> dict[str, str]:
         else:
             month_name = fields[0][:3]
             year = int(fields[1])
-        month_num = MONTH_LOOKUP.index(month_name) + 1
+        month_num = MONTH_LOOKUP[month_name]
 
         # Save it
         out[f"{month_num}/{year}"] = pdf_url
@@ -95,28 +182,91 @@ def get_scraping_driver(dirname):
     return driver
 
 
+class ScrapingSession:
+    """
+    A temporary download directory and a scraping driver that is only
+    started when it is first needed.
+
+    Parameters
+    ----------
+    tmpdir :
+        the directory to download files to
+    """
+
+    def __init__(self, tmpdir: str):
+        self.tmpdir = tmpdir
+        self._driver = None
+
+    @property
+    def driver(self):
+        """The scraping driver."""
+        if self._driver is None:
+            self._driver = get_scraping_driver(self.tmpdir)
+        return self._driver
+
+    def close(self) -> None:
+        """Quit the driver, if it was started."""
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+# The active scraping session, shared by nested calls to scraping_session()
+_SESSION: Optional[ScrapingSession] = None
+
+
 @contextmanager
-def downloaded_pdf(driver, pdf_url, tmpdir, interval=1, time_limit=7):
+def scraping_session() -> Iterator[ScrapingSession]:
+    """
+    Context manager for a scraping session.
+
+    Nested sessions reuse the outermost one, so that multiple updates
+    can share one driver.
+    """
+    global _SESSION
+
+    # Reuse the active session
+    if _SESSION is not None:
+        yield _SESSION
+        return
+
+    # Download to a temporary directory
+    with tempfile.TemporaryDirectory() as tmpdir, cwd(tmpdir):
+        _SESSION = ScrapingSession(tmpdir)
+        try:
+            yield _SESSION
+        finally:
+            _SESSION.close()
+            _SESSION = None
+
+
+def _find_pdf(dirname: str) -> Optional[Path]:
+    """Internal function to return the first PDF file in a directory, if any."""
+    with os.scandir(dirname) as it:
+        for entry in it:
+            if entry.name.endswith(".pdf"):
+                return Path(entry.path)
+    return None
+
+
+@contextmanager
+def downloaded_pdf(driver, pdf_url, tmpdir, interval=0.1, time_limit=7):
     """Context manager to download a PDF to a local directory."""
 
-    # Output path
-    download_dir = Path(tmpdir)
     pdf_path = None
 
     try:
         # Get the PDF
         driver.get(pdf_url)
 
-        # Initialize
-        pdf_files = list(download_dir.glob("*.pdf"))
-        total_sleep = 0
-        while not len(pdf_files) and total_sleep <= time_limit:
+        # Poll until the download finishes or we run out of time
+        deadline = time.monotonic() + time_limit
+        pdf_path = _find_pdf(tmpdir)
+        while pdf_path is None and time.monotonic() <= deadline:
             time.sleep(interval)
-            total_sleep += interval
-            pdf_files = list(download_dir.glob("*.pdf"))
+            pdf_path = _find_pdf(tmpdir)
 
-        if len(pdf_files):
-            pdf_path = pdf_files[0]
+        if pdf_path is not None:
             yield pdf_path
         else:
             raise ValueError("PDF download failed")
@@ -124,3 +274,62 @@ def downloaded_pdf(driver, pdf_url, tmpdir, interval=1, time_limit=7):
         # Remove the file after we are done!
         if pdf_path is not None and pdf_path.exists():
             pdf_path.unlink()
+
+
+def _download_pdf(session: ScrapingSession, pdf_url: str, local_path: Path) -> None:
+    """Internal function to download a PDF to a local path."""
+    with downloaded_pdf(session.driver, pdf_url, session.tmpdir) as pdf_path:
+
+        if not local_path.parent.exists():
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+
+        pdf_path.rename(local_path)
+
+
+def download_pdfs(pdf_paths: dict[str, Path], max_workers: int = 1) -> None:
+    """
+    Download PDFs to local paths.
+
+    When downloading multiple PDFs with multiple workers, each thread
+    runs its own driver with a separate download directory, so that
+    the downloads do not collide.
+
+    Parameters
+    ----------
+    pdf_paths :
+        the local path to save each PDF url to
+    max_workers :
+        the maximum number of concurrent downloads
+    """
+    # Download serially, sharing the active session's driver
+    if max_workers <= 1 or len(pdf_paths) <= 1:
+        with scraping_session() as session:
+            for pdf_url, local_path in pdf_paths.items():
+                _download_pdf(session, pdf_url, local_path)
+        return
+
+    # One session per worker thread, started when the thread first needs it
+    local = threading.local()
+    sessions: list[ScrapingSession] = []
+
+    def _download(pdf_url: str, local_path: Path) -> None:
+        if not hasattr(local, "session"):
+            local.session = ScrapingSession(tempfile.mkdtemp())
+            sessions.append(local.session)
+        _download_pdf(local.session, pdf_url, local_path)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_download, pdf_url, local_path)
+                for pdf_url, local_path in pdf_paths.items()
+            ]
+
+            # Surface any exceptions
+            for future in as_completed(futures):
+                future.result()
+    finally:
+        # Quit the drivers and remove the download directories
+        for session in sessions:
+            session.close()
+            shutil.rmtree(session.tmpdir, ignore_errors=True)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import List
+import functools
+import os
+from typing import Callable, List
 
 import click
 import rich_click
@@ -10,6 +12,12 @@ import rich_click
 from .. import DATA_DIR
 
 
+@functools.lru_cache(maxsize=None)
+def _get_required_fields(model) -> tuple[str, ...]:
+    """Internal function to get the required fields of a pydantic model."""
+    return tuple(model.schema()["required"])
+
+
 def determine_file_name(f, **kwargs):
     """Given a function, determine the matching file name."""
 
@@ -26,11 +34,10 @@ def determine_file_name(f, **kwargs):
     # Function has required params
     if hasattr(f, "model"):
 
-        # Get the params
-        schema = f.model.schema()
-
         # Do all iterations of params
-        param_values: List[str] = [kwargs.get(k, "") for k in schema["required"]]
+        param_values: List[str] = [
+            kwargs.get(k, "") for k in _get_required_fields(f.model)
+        ]
 
         # If any are missing raise an error
         if any(value == "" for value in param_values):
@@ -46,11 +53,52 @@ def determine_file_name(f, **kwargs):
     return output_file
 
 
+def get_max_workers(workers: int, num_jobs: int) -> int:
+    """Cap the number of workers by the available CPUs and number of jobs."""
+    return max(1, min(workers, os.cpu_count() or 1, num_jobs))
+
+
 class RichClickGroup(click.Group):
     def format_help(self, ctx, formatter):
         rich_click.rich_format_help(self, ctx, formatter)
 
 
+class LazyRichClickGroup(RichClickGroup):
+    """
+    A group whose subcommands are only added when they are first needed.
+
+    This avoids importing the ETL and scraping modules when running other
+    commands or displaying the main help screen.
+
+    Parameters
+    ----------
+    load_commands :
+        function that adds the subcommands to the input group
+    """
+
+    def __init__(self, *args, load_commands: Callable[[click.Group], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._load_commands = load_commands
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._loaded = True
+            self._load_commands(self)
+
+    def list_commands(self, ctx):
+        self._ensure_loaded()
+        return super().list_commands(ctx)
+
+    def get_command(self, ctx, cmd_name):
+        self._ensure_loaded()
+        return super().get_command(ctx, cmd_name)
+
+    def format_help(self, ctx, formatter):
+        self._ensure_loaded()
+        super().format_help(ctx, formatter)
+
+
 class RichClickCommand(click.Command):
     def format_help(self, ctx, formatter):
         rich_click.rich_format_help(self, ctx, formatter)
@@ -1,10 +1,13 @@
 """Load processed collections data from the data cache."""
 
+import functools
+from pathlib import Path
+
 import pandas as pd
 
 from . import DATA_DIR
 
-CACHE_DIR = DATA_DIR / "processed" / "spending"
+CACHE_DIR = DATA_DIR / "processed" / "collections"
 
 
 __all__ = [
@@ -18,24 +21,42 @@ __all__ = [
 ]
 
 
+@functools.lru_cache(maxsize=8)
+def _read_csv(path: Path, mtime_ns: int) -> pd.DataFrame:
+    """
+    Internal function to read a data file.
+
+    Results are cached in memory, keyed by the file's modification time,
+    so repeated calls only parse the file once. The cache is bounded so
+    stale entries for rewritten files are evicted.
+    """
+    return pd.read_csv(path)
+
+
+def _load_data(filename: str) -> pd.DataFrame:
+    """Internal function to load a copy of a data file from the cache."""
+    path = CACHE_DIR / filename
+    return _read_csv(path, path.stat().st_mtime_ns).copy()
+
+
 def load_sales_collections_by_sector() -> pd.DataFrame:
     """Load annual sales tax collections by sector."""
-    return pd.read_csv(CACHE_DIR / "sales-collections-by-sector.csv")
+    return _load_data("sales-collections-by-sector.csv")
 
 
 def load_birt_collections_by_sector() -> pd.DataFrame:
     """Load annual BIRT collections by sector."""
-    return pd.read_csv(CACHE_DIR / "birt-collections-by-sector.csv")
+    return _load_data("birt-collections-by-sector.csv")
 
 
 def load_wage_collections_by_sector() -> pd.DataFrame:
     """Load quarterly wage tax collections by sector."""
-    return pd.read_csv(CACHE_DIR / "wage-collections-by-sector.csv")
+    return _load_data("wage-collections-by-sector.csv")
 
 
 def load_city_tax_collections() -> pd.DataFrame:
     """Load monthly City tax collections."""
-    return pd.read_csv(CACHE_DIR / "city-tax-collections.csv")
+    return _load_data("city-tax-collections.csv")
 
 
 def load_city_collections() -> pd.DataFrame:
@@ -43,9 +64,9 @@ def load_city_collections() -> pd.DataFrame:
     Load monthly collections for the City of Philadelphia. This includes tax,
     non-tax, and other government collections.
     """
-    return pd.read_csv(CACHE_DIR / "city-collections.csv")
+    return _load_data("city-collections.csv")
 
 
 def load_school_collections() -> pd.DataFrame:
     """Load monthly tax collections for the School District."""
-    return pd.read_csv(CACHE_DIR / "school-collections.csv")
+    return _load_data("school-collections.csv")
@@ -1,3 +1,5 @@
+"""Module for running ETL on collections data."""
+
 # ETL imports
 from .by_sector.birt import BIRTCollectionsBySector
 from .by_sector.rtt import RTTCollectionsBySector
@@ -7,3 +9,14 @@ from .monthly.city_nontax import CityNonTaxCollections
 from .monthly.city_other_govts import CityOtherGovtsCollections
 from .monthly.city_tax import CityTaxCollections
 from .monthly.school import SchoolTaxCollections
+
+__all__ = [
+    "BIRTCollectionsBySector",
+    "RTTCollectionsBySector",
+    "SalesCollectionsBySector",
+    "WageCollectionsBySector",
+    "CityNonTaxCollections",
+    "CityOtherGovtsCollections",
+    "CityTaxCollections",
+    "SchoolTaxCollections",
+]
@@ -1,6 +1,7 @@
 """Module for parsing BIRT collection reports."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
@@ -62,6 +63,7 @@ class BIRTCollectionsBySector(ETLPipeline):  # type: ignore
         self.path = self.get_data_directory("raw") / "tax-years-2004-2018.pdf"
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path.
 
@@ -127,7 +129,7 @@ class BIRTCollectionsBySector(ETLPipeline):  # type: ignore
         ).reset_index(drop=True)
 
         # Remove total
-        data = data.query("sector != 'Total'").copy()
+        data = data.loc[data["sector"] != "Total"].copy()
 
         # Set tax year as int
         data["tax_year"] = data["tax_year"].astype(int)
@@ -171,7 +173,7 @@ class BIRTCollectionsBySector(ETLPipeline):  # type: ignore
         )
         data["parent_sector"] = data["parent_sector"].replace("", np.nan)
 
-        return data.sort_values("tax_year", ascending=False).reset_index(drop=True)
+        return data.sort_values("tax_year", ascending=False, ignore_index=True)
 
     def validate(self, data: pd.DataFrame) -> bool:
         """Validate the input data."""
@@ -191,11 +193,14 @@ class BIRTCollectionsBySector(ETLPipeline):  # type: ignore
 
         return True
 
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
+
+        # Get the processed data path
+        return self.get_data_directory("processed") / "tax-years-2004-2018.csv"
+
     def load(self, data: pd.DataFrame) -> None:
         """Load the data."""
 
-        # Get the path
-        path = self.get_data_directory("processed") / "tax-years-2004-2018.csv"
-
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
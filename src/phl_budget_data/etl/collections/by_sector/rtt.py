@@ -1,5 +1,5 @@
-import calendar
 from dataclasses import dataclass
+from functools import lru_cache
 from operator import attrgetter
 from pathlib import Path
 from typing import Literal, Optional
@@ -11,6 +11,7 @@ import pdfplumber
 from ... import ETL_DATA_DIR, ETL_DATA_FOLDERS
 from ...core import ETLPipeline
 from ...utils import transformations as tr
+from ...utils.misc import MONTH_ABBRS
 from ...utils.pdf import extract_words, fuzzy_groupby
 
 CATEGORIES = [
@@ -79,17 +80,18 @@ class RTTCollectionsBySector(ETLPipeline):  # type: ignore
         # Rename columns to show quarter
         if self.quarter is not None:
             month_start = (self.quarter - 1) * 3 + 1
-            month_name_start = calendar.month_abbr[month_start].lower()
+            month_name_start = MONTH_ABBRS[month_start]
 
             month_end = month_start + 2
-            month_name_end = calendar.month_abbr[month_end].lower()
+            month_name_end = MONTH_ABBRS[month_end]
 
             self.month_name = f"{month_name_start}_to_{month_name_end}"
         elif self.month is not None:
             # Month name
-            self.month_name = calendar.month_abbr[self.month].lower()
+            self.month_name = MONTH_ABBRS[self.month]
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path.
 
@@ -234,15 +236,18 @@ class RTTCollectionsBySector(ETLPipeline):  # type: ignore
 
         return True
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Path to save data to
+        # Get the processed data path
         dirname = self.get_data_directory("processed")
         if self.month is not None:
-            path = dirname / f"{self.year}-{self.month:02d}.csv"
+            return dirname / f"{self.year}-{self.month:02d}.csv"
         else:
-            path = dirname / f"{self.year}-Q{self.quarter}.csv"
+            return dirname / f"{self.year}-Q{self.quarter}.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
\ No newline at end of file
+        super()._load_csv_data(data, self.get_processed_path())
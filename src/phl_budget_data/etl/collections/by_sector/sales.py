@@ -1,6 +1,7 @@
 """Module for parsing sales collections reports."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
@@ -73,6 +74,7 @@ class SalesCollectionsBySector(ETLPipeline):  # type: ignore
         self.legacy = self.fiscal_year < 2017
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path.
 
@@ -214,12 +216,15 @@ class SalesCollectionsBySector(ETLPipeline):  # type: ignore
 
         return True
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Get the path
+        # Get the processed data path
         fy_tag = str(self.fiscal_year)[-2:]
-        path = self.get_data_directory("processed") / f"FY{fy_tag}.csv"
+        return self.get_data_directory("processed") / f"FY{fy_tag}.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
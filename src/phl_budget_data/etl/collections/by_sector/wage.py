@@ -1,7 +1,7 @@
 """Module for parsing wage collection reports."""
 
-import calendar
 from dataclasses import dataclass
+from functools import lru_cache
 from operator import attrgetter
 from pathlib import Path
 
@@ -12,6 +12,7 @@ import pdfplumber
 from ... import ETL_DATA_DIR, ETL_DATA_FOLDERS
 from ...core import ETLPipeline
 from ...utils import transformations as tr
+from ...utils.misc import MONTH_ABBRS
 from ...utils.pdf import extract_words, fuzzy_groupby
 
 SECTORS = [
@@ -99,7 +100,7 @@ class WageCollectionsBySector(ETLPipeline):  # type: ignore
             )
 
         # Month name
-        self.month_name = calendar.month_abbr[self.month].lower()
+        self.month_name = MONTH_ABBRS[self.month]
 
         # Number of pages
         with pdfplumber.open(self.path) as pdf:
@@ -111,10 +112,11 @@ class WageCollectionsBySector(ETLPipeline):  # type: ignore
 
         # Rename columns to show quarter
         if self.quarterly:
-            quarter_start = calendar.month_abbr[self.month - 2].lower()
+            quarter_start = MONTH_ABBRS[self.month - 2]
             self.month_name = f"{quarter_start}_to_{self.month_name}"
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path.
 
@@ -300,12 +302,15 @@ class WageCollectionsBySector(ETLPipeline):  # type: ignore
 
         return True
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Path to save data to
+        # Get the processed data path
         dirname = self.get_data_directory("processed")
-        path = dirname / f"{self.year}-{self.month:02d}.csv"
+        return dirname / f"{self.year}-{self.month:02d}.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
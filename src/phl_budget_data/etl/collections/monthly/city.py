@@ -1,23 +1,25 @@
 """Module for parsing montly city collections data."""
 
+from operator import attrgetter
 from typing import ClassVar, Optional
 
 import pandas as pd
 import pdfplumber
 
-from ...utils.pdf import extract_words, words_to_table
+from ...utils.pdf import Word, extract_words, words_to_table
 from ...utils.transformations import remove_empty_columns
 from .core import COLLECTION_TYPES, MonthlyCollectionsReport
 
 
-def find_top_cutoff(pg: pdfplumber.page.Page) -> float:
+def find_top_cutoff(pg: pdfplumber.page.Page, words: list[Word]) -> float:
     """
     Search for the top cutoff of header on the page.
 
-    This looks for specific text in the header.
+    This looks for specific text in the header, using the words
+    already extracted from the page.
     """
-    # Extract text to look for a header
-    pg_text = pg.extract_text()
+    # Join the words to look for a header
+    pg_text = " ".join(word.text for word in words)
 
     # This shows up in the header columns
     top = 0
@@ -46,6 +48,29 @@ def find_footer_cutoff(pg: pdfplumber.page.Page) -> Optional[dict[str, float]]:
         return None
 
 
+def crop_words(words: list[Word], top: float, bottom: float) -> list[Word]:
+    """
+    Keep the words between the top and bottom cutoffs.
+
+    This matches cropping the page before extracting the words: words
+    overlapping a cutoff are kept, with their bounding box clipped.
+    """
+    out = []
+    for word in words:
+        if word.bottom >= top and word.top <= bottom:
+            out.append(
+                word.copy(
+                    update={
+                        "top": max(word.top, top),
+                        "bottom": min(word.bottom, bottom),
+                    }
+                )
+            )
+
+    # Sort the words top to bottom and left to right
+    return sorted(out, key=attrgetter("top", "x0"))
+
+
 class CityCollectionsReport(MonthlyCollectionsReport):  # type: ignore
     """
     Monthly City Collections Report.
@@ -75,8 +100,13 @@ class CityCollectionsReport(MonthlyCollectionsReport):  # type: ignore
             out: list[pd.DataFrame] = []
             for pg_num, pg in enumerate(pdf.pages, start=1):
 
+                # Extract the words once for the whole page
+                all_words = extract_words(
+                    pg, keep_blank_chars=False, x_tolerance=1, y_tolerance=1
+                )
+
                 # Is there a width-spanning line at the top?
-                top = find_top_cutoff(pg)
+                top = find_top_cutoff(pg, all_words)
 
                 # Is there a width-spanning line at the bottom?
                 footer_cutoff = find_footer_cutoff(pg)
@@ -85,11 +115,8 @@ class CityCollectionsReport(MonthlyCollectionsReport):  # type: ignore
                 else:
                     bottom = pg.height
 
-                # Crop the main part of the document and extract the words
-                cropped = pg.crop([0, top, pg.width, bottom])
-                words = extract_words(
-                    cropped, keep_blank_chars=False, x_tolerance=1, y_tolerance=1
-                )
+                # Keep the words in the main part of the document
+                words = crop_words(all_words, top, bottom)
 
                 # Group the words into a table
                 data = words_to_table(
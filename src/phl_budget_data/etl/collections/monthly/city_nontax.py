@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pandas as pd
 
 from .city import CityCollectionsReport
@@ -70,15 +72,18 @@ class CityNonTaxCollections(CityCollectionsReport):  # type: ignore
 
         return df
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
         # Get the processed data path
         dirname = self.get_data_directory("processed")
-        path = dirname / f"{self.year}-{self.month:02d}-nontax.csv"
+        return dirname / f"{self.year}-{self.month:02d}-nontax.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
 
     def validate(self, data: pd.DataFrame) -> bool:
         """Validate the input data."""
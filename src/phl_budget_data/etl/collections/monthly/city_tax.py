@@ -1,5 +1,7 @@
 """City tax collections."""
 
+from pathlib import Path
+
 import pandas as pd
 
 from ...utils.misc import rename_tax_rows
@@ -18,7 +20,8 @@ class CityTaxCollections(CityCollectionsReport):  # type: ignore
         data = super().transform(data)
 
         # Split out just tax part
-        stop = data.index[data[0].str.contains("TOTAL TAX REVENUE") == True]
+        sel = data[0].str.contains("TOTAL TAX REVENUE", regex=False, na=False)
+        stop = data.index[sel]
         assert len(stop) == 1
         stop = stop[0]
 
@@ -142,20 +145,24 @@ class CityTaxCollections(CityCollectionsReport):  # type: ignore
         tax.columns = columns
 
         # Split out current/prior/total into its own column
-        tax["kind"] = tax["name"].apply(lambda x: x.split("_")[-1])
-        tax["name"] = tax["name"].apply(lambda x: "_".join(x.split("_")[:-1]))
+        parts = tax["name"].str.rsplit("_", n=1, expand=True)
+        tax["name"] = parts[0]
+        tax["kind"] = parts[1]
 
         return tax
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data into storage."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
         # Get the processed data path
         dirname = self.get_data_directory("processed")
-        path = dirname / f"{self.year}-{self.month:02d}-tax.csv"
+        return dirname / f"{self.year}-{self.month:02d}-tax.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data into storage."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
 
     def validate(self, data: pd.DataFrame) -> bool:
         """Validate the input data."""
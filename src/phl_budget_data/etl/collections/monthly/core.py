@@ -1,7 +1,7 @@
 """Base class for monthly collections reports for the City of Philadelphia."""
 
-import calendar
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import ClassVar, Literal
 
@@ -11,7 +11,7 @@ import pdfplumber
 from ... import ETL_DATA_DIR, ETL_DATA_FOLDERS
 from ...core import ETLPipeline
 from ...utils import transformations as tr
-from ...utils.misc import fiscal_from_calendar_year
+from ...utils.misc import MONTH_ABBRS, fiscal_from_calendar_year
 
 
 def get_column_names(month: int, calendar_year: int) -> list[str]:
@@ -21,7 +21,7 @@ def get_column_names(month: int, calendar_year: int) -> list[str]:
     fiscal_year = fiscal_from_calendar_year(month, calendar_year)
 
     # Get the month name
-    month_name = calendar.month_abbr[month].lower()
+    month_name = MONTH_ABBRS[month]
 
     # Fiscal year tsags
     this_year = f"fy{str(fiscal_year)[2:]}"
@@ -75,14 +75,17 @@ class MonthlyCollectionsReport(ETLPipeline):
                 f"No PDF available for month '{self.month}' and year '{self.year}' at '{self.path}'"
             )
 
-        # Get the number of pages
-        with pdfplumber.open(self.path) as pdf:
-            self.num_pages = len(pdf.pages)
-
         # Month name
-        self.month_name = calendar.month_abbr[self.month].lower()
+        self.month_name = MONTH_ABBRS[self.month]
+
+    @cached_property
+    def num_pages(self) -> int:
+        """The number of pages in the PDF (only opened when needed)."""
+        with pdfplumber.open(self.path) as pdf:
+            return len(pdf.pages)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: Literal[ETL_DATA_FOLDERS]) -> Path:
         """Internal function to get the file path.
 
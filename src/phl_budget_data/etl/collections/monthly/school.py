@@ -1,4 +1,5 @@
 """Module for parsing montly school collections data."""
+from pathlib import Path
 from typing import ClassVar
 
 import pandas as pd
@@ -140,8 +141,9 @@ class SchoolTaxCollections(MonthlyCollectionsReport):  # type: ignore
         data.columns = columns
 
         # Split out current/prior/total into its own column
-        data["kind"] = data["name"].apply(lambda x: x.split("_")[-1])
-        data["name"] = data["name"].apply(lambda x: "_".join(x.split("_")[:-1]))
+        parts = data["name"].str.rsplit("_", n=1, expand=True)
+        data["name"] = parts[0]
+        data["kind"] = parts[1]
 
         return data
 
@@ -160,12 +162,15 @@ class SchoolTaxCollections(MonthlyCollectionsReport):  # type: ignore
 
         return True
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Get the path
+        # Get the processed data path
         dirname = self.get_data_directory("processed")
-        path = dirname / f"{self.year}-{self.month:02d}-tax.csv"
+        return dirname / f"{self.year}-{self.month:02d}-tax.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
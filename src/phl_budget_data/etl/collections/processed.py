@@ -1,10 +1,24 @@
 """Load processed collections data."""
 
-import calendar
+import functools
+import hashlib
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Type
 
+import numpy as np
 import pandas as pd
 
-from ..utils.misc import fiscal_from_calendar_year
+from ... import USER_CACHE_DIR, __version__
+from ..core import ETLPipeline
+from ..utils.misc import (
+    MONTH_ABBRS,
+    atomic_path,
+    fiscal_from_calendar_year,
+    get_source_mtime_ns,
+    list_files,
+    map_concurrently,
+    read_csv_files,
+)
 
 # ETL imports
 from . import (
@@ -18,6 +32,12 @@ from . import (
     WageCollectionsBySector,
 )
 
+# Folder for caching the loaded data
+CACHE_DIR = USER_CACHE_DIR / "collections"
+
+# Low-cardinality string columns stored as categories
+CATEGORICAL_COLUMNS = ("name", "sector", "parent_sector", "category", "parent_category")
+
 __all__ = [
     "load_birt_collections_by_sector",
     "load_sales_collections_by_sector",
@@ -29,130 +49,213 @@ __all__ = [
 ]
 
 
+def _cache_to_disk(*classes: Type[ETLPipeline]) -> Callable:
+    """
+    Cache the results of a data loader on disk.
+
+    The cache is keyed by the pandas and package versions, the latest
+    modification time of the package source code, and the names and
+    modification times of the processed CSV files for the input ETL
+    classes, so it is invalidated whenever any of them change. The latest
+    result is also kept in memory to skip reading the cache file on
+    repeated calls.
+
+    Low-cardinality string columns are stored as categories in the cache
+    file, and are converted back to strings when loaded.
+    """
+
+    def decorator(func: Callable[[], pd.DataFrame]) -> Callable[[], pd.DataFrame]:
+
+        # The latest result, by cache key
+        memo: dict[str, pd.DataFrame] = {}
+
+        @functools.wraps(func)
+        def wrapper() -> pd.DataFrame:
+
+            # Get the processed files
+            files = set()
+            for cls in classes:
+                files.update(list_files(cls.get_data_directory("processed"), ".csv"))
+
+            # Hash the versions, source code, file names, and modification times
+            parts = [
+                f"pandas:{pd.__version__};",
+                f"{__package__}:{__version__};",
+                f"source:{get_source_mtime_ns()};",
+            ]
+            parts += [f"{f}:{f.stat().st_mtime_ns};" for f in sorted(files)]
+            key = hashlib.sha1("".join(parts).encode()).hexdigest()
+            path = CACHE_DIR / f"{func.__name__}-{key}.pkl"
+
+            # In-memory cache hit
+            if key in memo:
+                return memo[key].copy()
+
+            # Disk cache hit
+            data = _read_cache(path)
+
+            # Load the data, remove stale results, and save
+            if data is None:
+                data = _to_categories(func())
+                for f in CACHE_DIR.glob(f"{func.__name__}-*.pkl"):
+                    f.unlink(missing_ok=True)
+                with atomic_path(path) as tmp:
+                    data.to_pickle(tmp)
+
+            # Keep the latest result in memory, with the original dtypes
+            memo.clear()
+            memo[key] = _from_categories(data)
+
+            return memo[key].copy()
+
+        return wrapper
+
+    return decorator
+
+
+def _read_cache(path: Path) -> Optional[pd.DataFrame]:
+    """
+    Internal function to read a cached result, if it exists.
+
+    Unreadable cache files are treated as a miss and removed.
+    """
+    if not path.exists():
+        return None
+
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        path.unlink(missing_ok=True)
+        return None
+
+
+def _to_categories(data: pd.DataFrame) -> pd.DataFrame:
+    """Internal function to convert low-cardinality string columns to categories."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype("category")
+    return data
+
+
+def _from_categories(data: pd.DataFrame) -> pd.DataFrame:
+    """Internal function to convert categorical columns back to strings."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype(object)
+    return data
+
+
+@functools.lru_cache(maxsize=None)
+def _get_month_tags(month: int, year: int) -> tuple[str, int, str, str]:
+    """
+    Internal function to get the tags for the input calendar month and year.
+
+    Returns the month name, fiscal year, and the two-digit tags for
+    the current and prior fiscal years.
+    """
+    fiscal_year = fiscal_from_calendar_year(month, year)
+    return (
+        MONTH_ABBRS[month],
+        fiscal_year,
+        f"{fiscal_year % 100:02d}",
+        f"{(fiscal_year - 1) % 100:02d}",
+    )
+
+
+def _concat_csv_files(files: Iterable[Path]) -> pd.DataFrame:
+    """
+    Internal function to load and combine CSV files that share the same columns.
+
+    The file name (without suffix) for each row is stored in the "stem" column.
+    """
+    files = list(files)
+    return (
+        pd.concat(
+            read_csv_files(files),
+            keys=[f.stem for f in files],
+            names=["stem", None],
+            copy=False,
+        )
+        .reset_index(level="stem")
+        .reset_index(drop=True)
+    )
+
+
+@_cache_to_disk(SalesCollectionsBySector)
 def load_sales_collections_by_sector() -> pd.DataFrame:
     """Load annual sales tax collections by sector."""
 
     # Get the path to the files to load
     dirname = SalesCollectionsBySector.get_data_directory("processed")
-    files = dirname.glob("*.csv")
+    files = list_files(dirname, ".csv")
 
-    out = []
-    for f in files:
-
-        # Get fiscal year
-        fiscal_year = int(f"20{f.stem[2:]}")
-
-        # Load the data
-        df = (
-            pd.read_csv(f)[["total", "sector", "parent_sector"]]
-            .query("sector != 'Subtotal'")
-            .assign(
-                fiscal_year=fiscal_year,
-            )
-        )
-
-        # Save
-        out.append(df)
+    # Load all of the files at once
+    out = _concat_csv_files(files)
+    out = out.loc[out["sector"] != "Subtotal"]
 
-    # Combine multiple months
-    out = pd.concat(out, ignore_index=True)
+    # Get fiscal year from the file name, e.g., "FY22"
+    out = out[["total", "sector", "parent_sector"]].assign(
+        fiscal_year=2000 + out["stem"].str.slice(2).astype(int)
+    )
 
     return out.sort_values(
-        ["fiscal_year", "parent_sector", "sector"], ascending=True
-    ).reset_index(drop=True)
+        ["fiscal_year", "parent_sector", "sector"], ascending=True, ignore_index=True
+    )
 
 
+@_cache_to_disk(BIRTCollectionsBySector)
 def load_birt_collections_by_sector() -> pd.DataFrame:
     """Load annual BIRT collections by sector."""
 
     # Get the path to the files to load
     dirname = BIRTCollectionsBySector.get_data_directory("processed")
-    files = dirname.glob("*.csv")
-
-    out = []
-    for f in files:
-        out.append(pd.read_csv(f))
+    files = list_files(dirname, ".csv")
 
     # Combine multiple months
-    out = pd.concat(out, ignore_index=True)
+    out = pd.concat(read_csv_files(files), ignore_index=True, copy=False)
 
     return out.sort_values(
-        ["tax_year", "parent_sector", "sector"], ascending=True
-    ).reset_index(drop=True)
+        ["tax_year", "parent_sector", "sector"], ascending=True, ignore_index=True
+    )
 
 
+@_cache_to_disk(RTTCollectionsBySector)
 def load_rtt_collections_by_sector() -> pd.DataFrame:
     """Load quarterly RTT collections by sector."""
 
     # Get the path to the files to load
     dirname = RTTCollectionsBySector.get_data_directory("processed")
-    files = dirname.glob("*.csv")
-
-    # Fiscal quarters
-    fiscal_quarters = {
-        "jul": 1,
-        "aug": 1,
-        "sep": 1,
-        "oct": 2,
-        "nov": 2,
-        "dec": 2,
-        "jan": 3,
-        "feb": 3,
-        "mar": 3,
-        "apr": 4,
-        "may": 4,
-        "jun": 4,
-    }
-
-    calendar_to_fiscal_quarter = {1: 3, 2: 4, 3: 1, 4: 2}
-
-    out = []
-    for f in files:
-
-        # Quarterly data
-        if "Q" in f.stem:
-            year, quarter = f.stem.split("-")
-            year = int(year)
-            quarter = int(quarter[-1])
-
-            # Get the fiscal year
-            if quarter in [1, 2]:
-                fiscal_year = year
-            else:
-                fiscal_year = year + 1
-
-            # Fiscal quarter
-            fiscal_quarter = calendar_to_fiscal_quarter[quarter]
-
-        # Monthly data
-        else:
-            year, month = map(int, f.stem.split("-"))
-            month_name = calendar.month_abbr[month].lower()
+    files = list_files(dirname, ".csv")
 
-            # Determine the fiscal year and tags
-            fiscal_year = fiscal_from_calendar_year(month, year)
+    # Load all of the files at once
+    out = _concat_csv_files(files)
 
-            # Fiscal quarter
-            fiscal_quarter = fiscal_quarters[month_name]
+    # Get year and quarter/month from the file name, e.g., "2022-Q3" or "2022-09"
+    stems = out["stem"].str.split("-", expand=True)
+    year = stems[0].astype(int)
+    period = stems[1].str.lstrip("Q").astype(int)
 
-        # Load the data and trim to "total"
-        df = pd.read_csv(f)
+    # Quarterly data starts on the first month of the calendar quarter
+    month = np.where(stems[1].str.startswith("Q"), 3 * period - 2, period)
 
-        # The data
-        X = df[["category", "parent_category", "num_records", "total"]]
-
-        # Melt the data
-        X = X.melt(id_vars=["category", "parent_category"],).assign(
-            fiscal_quarter=fiscal_quarter,
+    # Add the fiscal tags and melt the data
+    out = (
+        out[["category", "parent_category", "num_records", "total"]]
+        .assign(
+            fiscal_quarter=(month - 7) % 12 // 3 + 1,
             year=year,
-            fiscal_year=fiscal_year,
+            fiscal_year=np.where(month < 7, year, year + 1),
         )
-
-        # Save
-        out.append(X)
-
-    # Combine into a single dataframe
-    out = pd.concat(out, ignore_index=True)
+        .melt(
+            id_vars=[
+                "category",
+                "parent_category",
+                "fiscal_quarter",
+                "year",
+                "fiscal_year",
+            ]
+        )
+    )
 
     # Aggregate by quarter
     out = out.groupby(
@@ -168,91 +271,61 @@ def load_rtt_collections_by_sector() -> pd.DataFrame:
         dropna=False,
     )["value"].sum()
 
-    # Map quarter to month
-    out["month_start"] = out["fiscal_quarter"].replace(
-        {1: "07", 2: "10", 3: "01", 4: "04"}
-    )
+    # Add date from the first month of the quarter
+    month_start = (3 * out["fiscal_quarter"] + 3) % 12 + 1
+    out["date"] = pd.to_datetime(dict(year=out["year"], month=month_start, day=1))
 
-    # Add date
-    out["date"] = pd.to_datetime(
-        out.apply(lambda r: f"{r['year']}-{r['month_start']}", axis=1)
-    )
-
-    return out.sort_values("date", ascending=False, ignore_index=True).drop(
-        columns=["month_start"]
-    )
+    return out.sort_values("date", ascending=False, ignore_index=True)
 
 
+@_cache_to_disk(WageCollectionsBySector)
 def load_wage_collections_by_sector() -> pd.DataFrame:
     """Load quarterly wage tax collections by sector."""
 
     # Get the path to the files to load
     dirname = WageCollectionsBySector.get_data_directory("processed")
-    files = dirname.glob("*.csv")
+    files = list_files(dirname, ".csv")
 
     # Month set
-    month_set = "|".join([calendar.month_abbr[i].lower() for i in range(1, 13)])
-
-    # Fiscal quarters
-    fiscal_quarters = {
-        "jul": 1,
-        "aug": 1,
-        "sep": 1,
-        "oct": 2,
-        "nov": 2,
-        "dec": 2,
-        "jan": 3,
-        "feb": 3,
-        "mar": 3,
-        "apr": 4,
-        "may": 4,
-        "jun": 4,
-    }
-
-    out = []
-    for f in files:
+    month_set = "|".join(MONTH_ABBRS[1:])
 
-        # Get month/year
-        year, month = map(int, f.stem.split("-"))
-        month_name = calendar.month_abbr[month].lower()
-
-        # Determine the fiscal year and tags
-        fiscal_year = fiscal_from_calendar_year(month, year)
-
-        # Load the data and trim to "total"
-        df = pd.read_csv(f)
+    # Trim each file to the id columns and its column of values
+    data = []
+    for f, df in zip(files, read_csv_files(files)):
 
         # Check for quarterly data
         # Example: "jan_to_mar_2022"
+        year = f.stem.split("-")[0]
         value_data = df.filter(regex=f"({month_set})_to_({month_set})_{year}$", axis=1)
 
         # Monthly data?
         if not len(value_data.columns):
             value_data = df.filter(regex=f"({month_set})_{year}$", axis=1)
 
-        # Join the data with id columns
-        X = df[["sector", "parent_sector"]].join(value_data)
-
-        # Melt the data
-        X = (
-            X.melt(
-                id_vars=["sector", "parent_sector"],
-                value_name="total",
-            )
-            .assign(
-                fiscal_quarter=fiscal_quarters[month_name],
-                year=year,
-                fiscal_year=fiscal_year,
-                total=lambda df: df.total.fillna(0),
-            )
-            .drop(labels=["variable"], axis=1)
-        )
+        # Each file should have a single column of values
+        if len(value_data.columns) != 1:
+            raise ValueError(f"Expected a single value column in '{f.name}'")
 
-        # Save
-        out.append(X)
+        data.append(df[["sector", "parent_sector"]].assign(total=value_data.iloc[:, 0]))
 
     # Combine into a single dataframe
-    out = pd.concat(out, ignore_index=True)
+    out = pd.concat(
+        data, keys=[f.stem for f in files], names=["stem", None], copy=False
+    )
+    out = out.reset_index(level="stem").reset_index(drop=True)
+
+    # Get year and month from the file name, e.g., "2022-09"
+    stems = out.pop("stem").str.split("-", expand=True)
+    year = stems[0].astype(int)
+    month = stems[1].astype(int)
+
+    # Add the fiscal tags
+    out = out.assign(
+        total=out["total"].fillna(0),
+        fiscal_quarter=(month - 7) % 12 // 3 + 1,
+        year=year,
+        fiscal_year=np.where(month < 7, year, year + 1),
+    )
 
     # Aggregate by quarter
     out = out.groupby(
@@ -261,103 +334,128 @@ def load_wage_collections_by_sector() -> pd.DataFrame:
         dropna=False,
     )["total"].sum()
 
-    # Map quarter to month
-    out["month_start"] = out["fiscal_quarter"].replace(
-        {1: "07", 2: "10", 3: "01", 4: "04"}
-    )
+    # Add date from the first month of the quarter
+    month_start = (3 * out["fiscal_quarter"] + 3) % 12 + 1
+    out["date"] = pd.to_datetime(dict(year=out["year"], month=month_start, day=1))
 
-    # Add date
-    out["date"] = pd.to_datetime(
-        out.apply(lambda r: f"{r['year']}-{r['month_start']}", axis=1)
-    )
+    return out.sort_values("date", ascending=False, ignore_index=True)
 
-    return out.sort_values("date", ascending=False, ignore_index=True).drop(
-        columns=["month_start"]
-    )
 
+def _get_monthly_columns(path: Path) -> tuple[int, int, str, int, str, str]:
+    """
+    Internal function to get the month, year, month name, fiscal year, and
+    the current and prior fiscal year column names for a monthly file.
+    """
+    # Get month/year
+    year, month, *_ = path.stem.split("-")
+    year = int(year)
+    month = int(month)
 
-def _load_monthly_collections(files, total_only=False):
-    """Internal function to load monthly collections data."""
+    # Determine the fiscal year and tags
+    month_name, fiscal_year, this_FY, last_FY = _get_month_tags(month, year)
 
-    out = []
+    # Column names for this month
+    a = f"{month_name}_fy{this_FY}"
+    b = f"{month_name}_fy{last_FY}"
 
-    # IMPORTANT: loop over files in descending order
-    for f in sorted(files, reverse=True):
-
-        # Get month/year
-        year, month, *_ = f.stem.split("-")
-        year = int(year)
-        month = int(month)
-        month_name = calendar.month_abbr[month].lower()
-
-        # Determine the fiscal year and tags
-        fiscal_year = fiscal_from_calendar_year(month, year)
-        this_FY = str(fiscal_year)[2:]
-        last_FY = str(fiscal_year - 1)[2:]
-
-        # Load the data
-        df = pd.read_csv(f)
-        if total_only:
-            df = df.query("kind == 'total'")
-
-        # Keep the kind column?
-        keep_kind = "kind" in df.columns and df["kind"].nunique() > 1
-
-        # Column names for this month
-        a = f"{month_name}_fy{this_FY}"
-        b = f"{month_name}_fy{last_FY}"
-
-        # Trim to the columns we want
-        cols = ["name", a, b]
-        if keep_kind:
-            cols.append("kind")
-        X = df[cols].rename(columns=dict(zip([a, b], [fiscal_year, fiscal_year - 1])))
-
-        id_vars = ["name"]
-        if keep_kind:
-            id_vars.append("kind")
-
-        # Melt the data
-        X = X.melt(id_vars=id_vars, var_name="fiscal_year", value_name="total").assign(
-            month_name=month_name,
-            month=month,
-            fiscal_month=((month - 7) % 12 + 1),
-            year=lambda df: df.apply(
-                lambda r: r["fiscal_year"] if r["month"] < 7 else r["fiscal_year"] - 1,
-                axis=1,
-            ),
-        )
-        X = X.fillna(0)
+    return month, year, month_name, fiscal_year, a, b
 
-        # Save
-        out.append(X)
 
+@functools.lru_cache(maxsize=512)
+def _read_monthly_file(path: Path, mtime_ns: int) -> pd.DataFrame:
+    """
+    Internal function to read the columns needed from a monthly file.
+
+    Results are cached in memory, keyed by the file's modification time,
+    so the City tax files shared by two loaders are only parsed once.
+    The cache is bounded, holding about one full set of monthly files.
+    """
+    *_, a, b = _get_monthly_columns(path)
+
+    # Only parse the columns we need
+    usecols = {"name", "kind", a, b}
+    return pd.read_csv(path, usecols=lambda col: col in usecols)
+
+
+def _load_monthly_file(path: Path, mtime_ns: int, total_only: bool) -> pd.DataFrame:
+    """Internal function to load a single month of collections data."""
+
+    month, _, month_name, fiscal_year, a, b = _get_monthly_columns(path)
+    df = _read_monthly_file(path, mtime_ns)
+
+    # Trim to totals
+    if total_only:
+        df = df.loc[df["kind"] == "total"]
+
+    # Keep the kind column?
+    keep_kind = "kind" in df.columns and df["kind"].nunique() > 1
+
+    # Stack the current and prior fiscal year columns (equivalent to a melt)
+    id_vars = ["name", "kind"] if keep_kind else ["name"]
+    fiscal_years = np.repeat([fiscal_year, fiscal_year - 1], len(df))
+    X = {col: np.tile(df[col].fillna(0).to_numpy(), 2) for col in id_vars}
+    X["fiscal_year"] = fiscal_years
+    X["total"] = np.nan_to_num(np.concatenate([df[a].to_numpy(), df[b].to_numpy()]))
+
+    # Add the month tags and the calendar year
+    X["month_name"] = month_name
+    X["month"] = month
+    X["fiscal_month"] = (month - 7) % 12 + 1
+    X["year"] = fiscal_years if month < 7 else fiscal_years - 1
+
+    return pd.DataFrame(X)
+
+
+def _read_monthly_files(
+    files: list[Path], total_only: list[bool]
+) -> list[pd.DataFrame]:
+    """Internal function to read monthly collections files in a thread pool."""
+    mtimes = [f.stat().st_mtime_ns for f in files]
+    return map_concurrently(_load_monthly_file, files, mtimes, total_only)
+
+
+def _combine_monthly_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Internal function to combine monthly collections data.
+
+    The input frames should be in descending order by file name.
+    """
     # Combine multiple months
-    out = pd.concat(out, ignore_index=True)
-    out["date"] = pd.to_datetime(
-        out["month"].astype(str) + "/" + out["year"].astype(str)
-    )
+    out = pd.concat(frames, ignore_index=True, copy=False)
+    out["date"] = pd.to_datetime(dict(year=out["year"], month=out["month"], day=1))
 
     # IMPORTANT: drop duplicates, keeping first
     # This keeps latest data, if it is revised
     subset = ["name", "month", "year"]
-    if keep_kind:
+    if "kind" in out.columns:
         subset.append("kind")
     out = out.drop_duplicates(subset=subset, keep="first")
 
-    return out.sort_values("date", ascending=False).reset_index(drop=True)
+    return out.sort_values("date", ascending=False, ignore_index=True)
+
+
+def _load_monthly_collections(files, total_only=False):
+    """Internal function to load monthly collections data."""
+
+    # IMPORTANT: loop over files in descending order
+    files = sorted(files, reverse=True)
+    frames = _read_monthly_files(files, [total_only] * len(files))
+
+    return _combine_monthly_frames(frames)
 
 
+@_cache_to_disk(CityTaxCollections)
 def load_city_tax_collections() -> pd.DataFrame:
     """Load monthly City tax collections."""
 
     # Get the path to the files to load
     dirname = CityTaxCollections.get_data_directory("processed")
-    files = dirname.glob(f"*-tax.csv")
+    files = list_files(dirname, "-tax.csv")
 
     return _load_monthly_collections(files, total_only=False)
 
 
+@_cache_to_disk(CityTaxCollections, CityNonTaxCollections, CityOtherGovtsCollections)
 def load_city_collections() -> pd.DataFrame:
     """
     Load monthly collections for the City of Philadelphia. This includes tax, non-tax,
@@ -372,28 +470,35 @@ def load_city_collections() -> pd.DataFrame:
         CityOtherGovtsCollections,
     ]
 
-    out = []
-    for cls, label, tag in zip(classes, labels, tags):
+    # Get the files to load for each kind, in descending order
+    files = [
+        list_files(cls.get_data_directory("processed"), f"-{tag}.csv")[::-1]
+        for cls, tag in zip(classes, tags)
+    ]
 
-        # Get the path to the files to load
-        dirname = cls.get_data_directory("processed")
-        files = dirname.glob(f"*-{tag}.csv")
+    # Read all of the files at once
+    frames = _read_monthly_files(
+        [f for kind_files in files for f in kind_files],
+        [tag == "tax" for tag, kind_files in zip(tags, files) for _ in kind_files],
+    )
 
-        # Load
-        out.append(
-            _load_monthly_collections(files, total_only=(tag == "tax")).assign(
-                kind=label
-            )
-        )
+    # Combine each kind separately
+    out = []
+    start = 0
+    for label, kind_files in zip(labels, files):
+        stop = start + len(kind_files)
+        out.append(_combine_monthly_frames(frames[start:stop]).assign(kind=label))
+        start = stop
 
-    return pd.concat(out, ignore_index=True)
+    return pd.concat(out, ignore_index=True, copy=False)
 
 
+@_cache_to_disk(SchoolTaxCollections)
 def load_school_collections() -> pd.DataFrame:
     """Load monthly tax collections for the School District."""
 
     # Get the path to the files to load
     dirname = SchoolTaxCollections.get_data_directory("processed")
-    files = dirname.glob("*-tax.csv")
+    files = list_files(dirname, "-tax.csv")
 
     return _load_monthly_collections(files, total_only=True)
@@ -4,8 +4,9 @@ import importlib
 import inspect
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Iterator, Type
+from typing import Callable, Iterator, Optional, Type
 
 import pandas as pd
 from loguru import logger
@@ -14,6 +15,7 @@ from pydantic.main import ModelMetaclass
 
 from . import ETL_DATA_FOLDERS
 from .utils.aws import parse_pdf_with_textract
+from .utils.misc import get_source_mtime_ns, list_files
 
 
 def validate_data_schema(data_schema: ModelMetaclass) -> Callable:
@@ -102,6 +104,28 @@ class ETLPipeline(ABC):
         logger.info(f"Saving file to {str(path)}")
         data.to_csv(path, index=False)
 
+    def get_processed_path(self) -> Optional[Path]:
+        """
+        Get the path to the processed data file.
+
+        By default, returns None, i.e., the path is not known.
+        """
+        return None
+
+    def is_processed(self) -> bool:
+        """
+        Whether the processed data file exists and is newer than
+        the raw PDF file and the package source code.
+        """
+        # Get the processed path
+        output_path = self.get_processed_path()
+        if output_path is None or not output_path.exists():
+            return False
+
+        # Compare modification times
+        source_mtime_ns = max(self.path.stat().st_mtime_ns, get_source_mtime_ns())
+        return output_path.stat().st_mtime_ns >= source_mtime_ns
+
     @classmethod
     @abstractmethod
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
@@ -119,7 +143,7 @@ class ETLPipeline(ABC):
     def get_pdf_files(cls) -> Iterator[Path]:
         """Yield raw PDF file paths."""
 
-        yield from sorted(cls.get_data_directory("raw").glob("**/*.pdf"))
+        yield from list_files(cls.get_data_directory("raw"), ".pdf", recursive=True)
 
     def extract_transform(self) -> pd.DataFrame:
         """Convenience function to extract and then transform."""
@@ -149,9 +173,10 @@ class ETLPipeline(ABC):
         # Extract & transform
         data = self.extract_transform()
 
-        # Validate?
-        if validate:
-            assert self.validate(data) == True
+        # Validate? Skip the call if the default validate() is used
+        if validate and type(self).validate is not ETLPipeline.validate:
+            if not self.validate(data):
+                raise ValueError(f"Data validation failed for '{self.path}'")
 
         # Load the data
         self.load(data)
@@ -211,12 +236,16 @@ class ETLPipelineAWS(ETLPipeline):  # type: ignore
         return pd.read_csv(filename)
 
 
+@lru_cache(maxsize=1)
 def get_etl_sources() -> defaultdict[str, list[Type[ETLPipeline]]]:
     """
     Get all of the ETL sources available.
 
     The classes are grouped according to their module:
     "qcmr", "collections", "spending".
+
+    The result is cached, since the sources are discovered by importing
+    every module in this package.
     """
     # Current folder and package name
     current_folder = Path(__file__).parent.resolve()
@@ -1,6 +1,7 @@
 """Base class for parsing the Quarterly City Manager's Report."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import ClassVar, Literal
 
@@ -70,20 +71,24 @@ class ETLPipelineQCMR(ETLPipelineAWS):
             self.num_pages = len(pdf.pages)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path."""
         return ETL_DATA_DIR / kind / "qcmr" / cls.dtype
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Get the path
+        # Get the processed data path
         dirname = self.get_data_directory("processed")
         tag = str(self.fiscal_year)[2:]
-        path = dirname / f"FY{tag}-Q{self.quarter}.csv"
+        return dirname / f"FY{tag}-Q{self.quarter}.csv"
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
 
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
 
     @classmethod
     def extract_transform_load_all(cls, fresh: bool = False) -> None:
@@ -1,5 +1,6 @@
 """Base class for parsing the Cash Flow Forecast from the QCMR."""
 
+from functools import lru_cache
 from pathlib import Path
 from typing import ClassVar, Literal
 
@@ -29,6 +30,7 @@ class CashFlowForecast(ETLPipelineQCMR):  # type: ignore
     report_dtype: ClassVar[CASH_DATA_TYPE]
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: ETL_DATA_FOLDERS) -> Path:
         """Internal function to get the file path."""
 
@@ -7,7 +7,7 @@ import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
 
-from ..utils.misc import fiscal_year_quarter_from_path
+from ..utils.misc import fiscal_year_quarter_from_path, list_files, read_csv_files
 from . import cash, obligations, personal_services, positions
 from .base import ETLPipelineQCMR
 from .cash.core import CASH_DATA_TYPE
@@ -19,6 +19,73 @@ __all__ = [
     "load_personal_services_summary",
 ]
 
+# The ETL class for each kind of cash report
+CASH_REPORT_CLASSES = {
+    "fund-balances": cash.CashReportFundBalances,
+    "net-cash-flow": cash.CashReportNetCashFlow,
+    "revenue": cash.CashReportRevenue,
+    "spending": cash.CashReportSpending,
+}
+
+# The category names for each kind of cash report
+CASH_REPORT_CATEGORIES = {
+    "spending": {
+        "payroll": "Payroll",
+        "employee_benefits": "Employee Benefits",
+        "pension": "Pension",
+        "purchases_of_services": "Contracts / Leases",
+        "materials_equipment": "Materials / Equipment",
+        "contributions_indemnities": "Contributions / Indemnities",
+        "advances_misc_payments": "Advances / Labor Obligations",
+        "debt_service_long": "Long-Term Debt Service",
+        "debt_service_short": "Short-Term Debt Service",
+        "current_year_appropriation": "Current Year Appropriation",
+        "total_disbursements": "Total Disbursements",
+        "prior_year_encumbrances": "Prior Year Encumbrances",
+        "prior_year_vouchers_payable": "Prior Year Vouchers Payable",
+        "interfund_charges": "Interfund Charges",
+    },
+    "revenue": {
+        "real_estate_tax": "Real Estate Tax",
+        "wage_earnings_net_profits": "Wage, Earnings, Net Profits",
+        "total_wage_earnings_net_profits": "Wage, Earnings, Net Profits",
+        "realty_transfer_tax": "Realty Transfer Tax",
+        "sales_tax": "Sales Tax",
+        "business_income_and_receipts_tax": "BIRT",
+        "beverage_tax": "Beverage Tax",
+        "total_pica_other_governments": "PICA Other Governments",
+        "total_other_governments": "Other Governments",
+        "total_cash_receipts": "Total Cash Receipts",
+        "locally_generated_nontax": "Locally Generated Non-Tax",
+        "other_taxes": "Other Taxes",
+        "collection_of_prior_year_revenue": "Prior Year Revenue",
+        "interfund_transfers": "Interfund Transfers",
+        "other_fund_balance_adjustments": "Other Adjustments",
+        "total_current_revenue": "Total Current Revenue",
+    },
+    "fund-balances": {
+        "general": "General Fund",
+        "community_development": "Community Development",
+        "hospital_assessment_fund": "Hospital Assessment Fund",
+        "housing_trust_fund": "Housing Trust Fund",
+        "budget_stabilization_fund": "Budget Stabilization Fund",
+        "other_funds": "Other Funds",
+        "total_operating_funds": "Total Operating Funds",
+        "capital_improvement": "Capital Improvement",
+        "industrial_and_commercial_dev": "Industrial and Commercial Development",
+        "total_capital_funds": "Total Capital Funds",
+        "grants_revenue": "Grants Fund",
+        "total_fund_equity": "Consolidated Cash",
+        "vehicle_rental_tax": "Vehicle Rental Tax",
+    },
+    "net-cash-flow": {
+        "tran": "TRAN",
+        "closing_balance": "Closing Balance",
+        "excess_of_receipts_over_disbursements": "Receipts - Disbursements",
+        "opening_balance": "Opening Balance",
+    },
+}
+
 
 def _load_processed_results(
     cls: Type[ETLPipelineQCMR],
@@ -27,7 +94,7 @@ def _load_processed_results(
 
     # Get the files
     dirname = cls.get_data_directory("processed")
-    files = sorted(dirname.glob("*.csv"), reverse=True)
+    files = list_files(dirname, ".csv")[::-1]
 
     # Loop over each file
     for f in files:
@@ -55,10 +122,12 @@ def _load_department_reports(cls: Type[ETLPipelineQCMR]) -> pd.DataFrame:
         df = pd.read_csv(f, dtype={"dept_code": str})
 
         # Get historical actuals
-        historical_actuals = df.query(
-            f"variable == 'Actual' and time_period == 'Full Year'"
-        )
-        duplicates = historical_actuals.query("fiscal_year in @fiscal_years")
+        historical_actuals = df.loc[
+            (df["variable"] == "Actual") & (df["time_period"] == "Full Year")
+        ]
+        duplicates = historical_actuals.loc[
+            historical_actuals["fiscal_year"].isin(list(fiscal_years))
+        ]
 
         # Update the fiscal years
         fiscal_years.update(set(historical_actuals["fiscal_year"]))
@@ -67,10 +136,12 @@ def _load_department_reports(cls: Type[ETLPipelineQCMR]) -> pd.DataFrame:
         df = df.drop(duplicates.index)
 
         # Also remove adopted budget duplicates
-        adopted_budget = df.query(
-            f"variable == 'Adopted Budget' and time_period == 'Full Year'"
-        )
-        duplicates = adopted_budget.query("fiscal_year in @report_fiscal_years")
+        adopted_budget = df.loc[
+            (df["variable"] == "Adopted Budget") & (df["time_period"] == "Full Year")
+        ]
+        duplicates = adopted_budget.loc[
+            adopted_budget["fiscal_year"].isin(list(report_fiscal_years))
+        ]
 
         # Update the fiscal years
         report_fiscal_years.update([fiscal_year])
@@ -86,17 +157,17 @@ def _load_department_reports(cls: Type[ETLPipelineQCMR]) -> pd.DataFrame:
         all_df.append(df)
 
     # Combine them!
-    out = pd.concat(all_df, ignore_index=True)
+    out = pd.concat(all_df, ignore_index=True, copy=False)
 
     # Make into a date
-    out["as_of_date"] = pd.to_datetime(out["as_of_date"])
+    out["as_of_date"] = pd.to_datetime(out["as_of_date"], format="%Y-%m-%d")
 
     # Dept major code
     out["dept_major_code"] = out["dept_code"].str.slice(0, 2)
 
     return out.sort_values(
-        ["report_fiscal_year", "report_quarter"], ascending=False
-    ).reset_index(drop=True)
+        ["report_fiscal_year", "report_quarter"], ascending=False, ignore_index=True
+    )
 
 
 def load_personal_services_summary() -> pd.DataFrame:
@@ -121,7 +192,7 @@ def load_fulltime_positions() -> pd.DataFrame:
     df = _load_department_reports(positions.FullTimePositions)
 
     # Remove duplicates of YTD and full year for Q4 data
-    actuals = df.query("variable == 'Actual'")
+    actuals = df.loc[df["variable"] == "Actual"]
     duplicates = actuals.loc[
         actuals.duplicated(subset=["as_of_date", "fund", "dept_code"])
     ]
@@ -168,100 +239,43 @@ def load_cash_reports(kind: CASH_DATA_TYPE) -> pd.DataFrame:
     -----
     See raw PDF files in the "data/raw/qcmr/cash/" folder.
     """
-    classes = {
-        "fund-balances": cash.CashReportFundBalances,
-        "net-cash-flow": cash.CashReportNetCashFlow,
-        "revenue": cash.CashReportRevenue,
-        "spending": cash.CashReportSpending,
-    }
-    cls = classes[kind]
-
-    # Formatting
-    formatting = {
-        "spending": {
-            "payroll": "Payroll",
-            "employee_benefits": "Employee Benefits",
-            "pension": "Pension",
-            "purchases_of_services": "Contracts / Leases",
-            "materials_equipment": "Materials / Equipment",
-            "contributions_indemnities": "Contributions / Indemnities",
-            "advances_misc_payments": "Advances / Labor Obligations",
-            "debt_service_long": "Long-Term Debt Service",
-            "debt_service_short": "Short-Term Debt Service",
-            "current_year_appropriation": "Current Year Appropriation",
-            "total_disbursements": "Total Disbursements",
-            "prior_year_encumbrances": "Prior Year Encumbrances",
-            "prior_year_vouchers_payable": "Prior Year Vouchers Payable",
-            "interfund_charges": "Interfund Charges",
-        },
-        "revenue": {
-            "real_estate_tax": "Real Estate Tax",
-            "wage_earnings_net_profits": "Wage, Earnings, Net Profits",
-            "total_wage_earnings_net_profits": "Wage, Earnings, Net Profits",
-            "realty_transfer_tax": "Realty Transfer Tax",
-            "sales_tax": "Sales Tax",
-            "business_income_and_receipts_tax": "BIRT",
-            "beverage_tax": "Beverage Tax",
-            "total_pica_other_governments": "PICA Other Governments",
-            "total_other_governments": "Other Governments",
-            "total_cash_receipts": "Total Cash Receipts",
-            "locally_generated_nontax": "Locally Generated Non-Tax",
-            "other_taxes": "Other Taxes",
-            "collection_of_prior_year_revenue": "Prior Year Revenue",
-            "interfund_transfers": "Interfund Transfers",
-            "other_fund_balance_adjustments": "Other Adjustments",
-            "total_current_revenue": "Total Current Revenue",
-        },
-        "fund-balances": {
-            "general": "General Fund",
-            "community_development": "Community Development",
-            "hospital_assessment_fund": "Hospital Assessment Fund",
-            "housing_trust_fund": "Housing Trust Fund",
-            "budget_stabilization_fund": "Budget Stabilization Fund",
-            "other_funds": "Other Funds",
-            "total_operating_funds": "Total Operating Funds",
-            "capital_improvement": "Capital Improvement",
-            "industrial_and_commercial_dev": "Industrial and Commercial Development",
-            "total_capital_funds": "Total Capital Funds",
-            "grants_revenue": "Grants Fund",
-            "total_fund_equity": "Consolidated Cash",
-            "vehicle_rental_tax": "Vehicle Rental Tax",
-        },
-        "net-cash-flow": {
-            "tran": "TRAN",
-            "closing_balance": "Closing Balance",
-            "excess_of_receipts_over_disbursements": "Receipts - Disbursements",
-            "opening_balance": "Opening Balance",
-        },
-    }
-
-    # Loop over all files
-    out = []
-    for f, fiscal_year, quarter in _load_processed_results(cls):  # type: ignore
-
-        # Load the CSV data
-        df = pd.read_csv(f)
-
-        # Drop month = 13 (total)
-        df = df.query("fiscal_month != 13")
-
-        df = df.assign(
-            fiscal_year=fiscal_year,
-            quarter=quarter,
-            month=lambda df: np.where(
-                df.fiscal_month < 7, df.fiscal_month + 6, df.fiscal_month - 6
-            ),
-        )
-
-        categories = df["category"].drop_duplicates()
-        missing = ~categories.isin(formatting[kind])
-        if missing.sum():
-            missing = categories.loc[missing]
-            raise ValueError(f"Missing category replacements: {missing.tolist()}")
-        df["category"] = df["category"].replace(formatting[kind])
-
-        out.append(df)
-
-    return pd.concat(out, ignore_index=True).sort_values(
+    cls = CASH_REPORT_CLASSES[kind]
+
+    # The category replacements for this kind, as integer codes and labels
+    replacements = CASH_REPORT_CATEGORIES[kind]
+    category_dtype = pd.CategoricalDtype(list(replacements))
+    labels = np.array(list(replacements.values()), dtype=object)
+
+    # Load all of the files at once
+    results = list(_load_processed_results(cls))  # type: ignore
+    data = read_csv_files(f for f, _, _ in results)
+
+    # Combine all files, tagged by fiscal year and quarter
+    df = pd.concat(
+        [
+            X.assign(fiscal_year=fiscal_year, quarter=quarter)
+            for X, (_, fiscal_year, quarter) in zip(data, results)
+        ],
+        ignore_index=True,
+        copy=False,
+    )
+
+    # Drop month = 13 (total)
+    df = df.loc[df["fiscal_month"] != 13]
+    df = df.assign(
+        month=lambda df: np.where(
+            df.fiscal_month < 7, df.fiscal_month + 6, df.fiscal_month - 6
+        ),
+    )
+
+    # Replace categories, checking for any without a replacement
+    codes = df["category"].astype(category_dtype).cat.codes.to_numpy()
+    missing = codes < 0
+    if missing.any():
+        missing = df["category"].loc[missing].drop_duplicates()
+        raise ValueError(f"Missing category replacements: {missing.tolist()}")
+    df["category"] = labels[codes]
+
+    return df.sort_values(
         ["fiscal_year", "quarter"], ascending=False, ignore_index=True
     )
@@ -6,6 +6,7 @@ from typing import Iterable, Literal
 import pandas as pd
 from pydantic import validate_arguments
 
+from ..utils.misc import read_csv_files
 from .summary import ActualDepartmentSpending, BudgetedDepartmentSpending
 
 __all__ = ["load_budgeted_department_spending", "load_actual_department_spending"]
@@ -14,11 +15,11 @@ __all__ = ["load_budgeted_department_spending", "load_actual_department_spending
 def _load_and_combine_csv_files(files: Iterable[Path]) -> pd.DataFrame:
     """Internal function to load and combine CSV files."""
 
-    out = []
-    for f in sorted(files):
-        out.append(pd.read_csv(f, dtype={"dept_code": str, "dept_major_code": str}))
+    out = read_csv_files(
+        sorted(files), dtype={"dept_code": str, "dept_major_code": str}
+    )
 
-    return pd.concat(out, ignore_index=True).drop_duplicates(
+    return pd.concat(out, ignore_index=True, copy=False).drop_duplicates(
         subset=["dept_code", "fiscal_year"], keep="first"
     )
 
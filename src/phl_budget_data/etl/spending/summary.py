@@ -1,6 +1,7 @@
 """Run ETL pipeline on the annual Budget Summary."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import ClassVar, Literal
 
@@ -111,7 +112,7 @@ def _fix_recession_reserve_data(df: pd.DataFrame) -> pd.DataFrame:
     Note: Any class 900 spending in Finance should be labeled as
     "Recession Reserve".
     """
-    finance = df.query("dept_code == '35'").copy()
+    finance = df.loc[df["dept_code"] == "35"].copy()
     finance_900 = finance["class_900"].copy()
 
     # Zero out
@@ -171,6 +172,7 @@ class BudgetSummaryBase(ETLPipeline):  # type: ignore
             self.value_column = f"FY{self.fiscal_year} Budgeted"
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_data_directory(cls, kind: Literal["raw", "processed", "interim"]) -> Path:
         """Return the path to the data."""
         return ETL_DATA_DIR / kind / "budget-in-brief"
@@ -365,20 +367,23 @@ class BudgetSummaryBase(ETLPipeline):  # type: ignore
 
         return True
 
-    def load(self, data: pd.DataFrame) -> None:
-        """Load the data."""
+    def get_processed_path(self) -> Path:
+        """Get the path to the processed data file."""
 
-        # Get the path
+        # Get the processed data path
         tag = str(self.fiscal_year)[2:]
-        path = (
+        return (
             self.get_data_directory("processed")
             / self.kind
             / self.flavor
             / f"FY{tag}.csv"
         )
 
+    def load(self, data: pd.DataFrame) -> None:
+        """Load the data."""
+
         # Load
-        super()._load_csv_data(data, path)
+        super()._load_csv_data(data, self.get_processed_path())
 
     @classmethod
     def extract_transform_load_all(cls, fresh: bool = False) -> None:
@@ -4,7 +4,6 @@ import tempfile
 from pathlib import Path
 from typing import Iterator, Literal, Optional
 
-import boto3
 import pandas as pd
 import pdfplumber
 from dotenv import find_dotenv, load_dotenv
@@ -125,6 +124,9 @@ def parse_pdf_with_textract(
     pg_num, data :
         A tuple of the page number and parsed data frame
     """
+    # Import here: boto3 is slow to import and only needed for Textract
+    import boto3
+
     # Load the credentials
     load_dotenv(find_dotenv())
 
@@ -2,13 +2,138 @@ from __future__ import annotations
 
 """Miscellaneous utility functions."""
 
+import calendar
+import os
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Tuple
+from typing import Callable, Iterable, Iterator, Literal, Tuple, TypeVar
 
 import pandas as pd
 
-
+T = TypeVar("T")
+
+# Lower-cased month abbreviations, indexed by month number
+MONTH_ABBRS = tuple(abbr.lower() for abbr in calendar.month_abbr)
+
+
+def list_files(dirname: Path, suffix: str, recursive: bool = False) -> list[Path]:
+    """
+    Return the sorted paths of the files in a directory ending with the suffix.
+
+    This uses :func:`os.scandir`, which exposes cached directory entries and
+    avoids the extra ``stat()`` calls made by :meth:`pathlib.Path.glob`.
+
+    Parameters
+    ----------
+    dirname :
+        the directory to search
+    suffix :
+        only include file names ending with this suffix, e.g., ".pdf"
+    recursive :
+        whether to also search sub-directories
+    """
+
+    def _scan(path: str) -> list[str]:
+        out = []
+        with os.scandir(path) as it:
+            for entry in it:
+                if recursive and entry.is_dir():
+                    out += _scan(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    out.append(entry.path)
+        return out
+
+    # Missing directories have no files
+    if not os.path.isdir(dirname):
+        return []
+
+    return [Path(f) for f in sorted(_scan(str(dirname)))]
+
+
+def get_source_mtime_ns() -> int:
+    """
+    Return the latest modification time of the package source code.
+
+    Results derived from the source code, such as cached or saved data,
+    are stale if any module changed after they were written.
+    """
+    package_dir = Path(__file__).parents[2]
+    files = list_files(package_dir, ".py", recursive=True)
+    return max(os.stat(f).st_mtime_ns for f in files)
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """
+    Context manager yielding a temporary path that replaces the input
+    path when the block succeeds.
+
+    Readers never see a partially written file, and the temporary file
+    is removed if writing fails.
+
+    Parameters
+    ----------
+    path :
+        the final path of the file
+    """
+    # Create the temporary file in the same folder, so it can be renamed
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+
+    try:
+        yield Path(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def map_concurrently(func: Callable[..., T], *iterables: Iterable) -> list[T]:
+    """
+    Apply a function to the input items in a thread pool, preserving the
+    input order.
+
+    Small inputs (five items or fewer) are processed serially, since
+    starting the threads costs more than it saves.
+
+    Parameters
+    ----------
+    func :
+        the function to apply
+    *iterables :
+        the arguments to pass to the function, as for :func:`map`
+    """
+    args = list(zip(*iterables))
+    if len(args) <= 5:
+        return [func(*arg) for arg in args]
+
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(lambda arg: func(*arg), args))
+
+
+def read_csv_files(files: Iterable[Path], **kwargs) -> list[pd.DataFrame]:
+    """
+    Read multiple CSV files concurrently, preserving the input order.
+
+    The pandas C parser releases the GIL, so the files are parsed
+    in a thread pool.
+
+    Parameters
+    ----------
+    files :
+        the paths to the CSV files
+    **kwargs :
+        additional keywords passed to :func:`pandas.read_csv`
+    """
+    return map_concurrently(lambda f: pd.read_csv(f, **kwargs), files)
+
+
+@lru_cache(maxsize=512)
 def fiscal_from_calendar_year(month_num: int, calendar_year: int) -> int:
     """Return the fiscal year for the input calendar year."""
 
@@ -128,6 +128,10 @@ def create_data_table(
     # Store the bottom y values of all of the row headers
     header_tops = np.array([h.top for h in headers])
 
+    # Label equal headers the same (headers are compared by value)
+    header_keys = [tuple(h.dict().values()) for h in headers]
+    header_labels = np.array([header_keys.index(key) for key in header_keys])
+
     # Set up the grid: nrows by ncols
     nrows = len(headers)
     ncols = len(columns) + 1
@@ -139,36 +143,37 @@ def create_data_table(
     # Add in the headers
     grid[:, 0] = [h.text for h in headers]
 
+    # No row headers to match to
+    if not nrows:
+        return pd.DataFrame(grid)
+
     # Loop over each column
     for col_num, xval in enumerate(columns):
 
         col = columns[xval]
         word_tops = np.array([w.top for w in col])
 
-        # Find closest row header
-        for row_num, h in enumerate(headers):
+        # Distance between each word (rows) and row header (columns)
+        diff = np.abs(word_tops[:, None] - header_tops[None, :])
+
+        # IMPORTANT: words can only match their closest row header
+        # Sometimes words will match to more than one header
+        closest_labels = header_labels[diff.argmin(axis=1)]
 
-            # Find closest word ot this row heasder
-            word_diff = np.abs(word_tops - h.top)
-            word_diff[word_diff > match_tol] = np.nan
+        # Find closest row header
+        for row_num in range(nrows):
 
             # Make sure the row header is vertically close enough
-            if np.isnan(word_diff).sum() < len(word_diff):
-
-                # Get the matching word for this row header
-                notnull = ~np.isnan(word_diff)
-                order = np.argsort(word_diff[notnull])
-                for word_index in np.where(notnull)[0][order]:
-                    word = col[word_index]
-
-                    # IMPORTANT: make sure this is the closest row header
-                    # Sometimes words will match to more than one header
-                    header_diff = np.abs(header_tops - word.top)
-                    header_index = np.argmin(header_diff)
-                    closest_header = headers[header_index]
-                    if closest_header == h:
-                        grid[row_num, col_num + 1] = col[word_index].text
-                        break
+            word_diff = diff[:, row_num]
+            (candidates,) = np.nonzero(word_diff <= match_tol)
+            if not len(candidates):
+                continue
+
+            # Get the closest word whose closest header is this one
+            candidates = candidates[np.argsort(word_diff[candidates])]
+            matches = candidates[closest_labels[candidates] == header_labels[row_num]]
+            if len(matches):
+                grid[row_num, col_num + 1] = col[matches[0]].text
 
     return pd.DataFrame(grid)
 
@@ -210,11 +215,14 @@ def remove_close_columns(
 
 def remove_orphan_columns(columns: Dict[float, List[Word]]) -> Dict[float, List[Word]]:
     """Remove any columns that are full subsets of another column."""
-    remove = []
+
+    # Compare the words in each column by value
+    word_sets = {k: {tuple(w.dict().values()) for w in columns[k]} for k in columns}
+
+    remove = set()
     for k in columns:
-        values = columns[k]
-        if any([all(val in columns[j] for val in values) for j in columns if j != k]):
-            remove.append(k)
+        if any(word_sets[k] <= word_sets[j] for j in columns if j != k):
+            remove.add(k)
 
     return {k: columns[k] for k in columns if k not in remove}
 